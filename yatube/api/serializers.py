@@ -0,0 +1,104 @@
+from collections import namedtuple
+
+from posts.counters import author_posts_count
+
+# columns — поля модели для .only(), related — связи для select_related,
+# getter — значение поля в ответе.
+Field = namedtuple('Field', 'columns related getter')
+
+
+class InvalidFields(ValueError):
+    """В ?fields= запрошены неизвестные поля."""
+
+
+class Serializer:
+    """Простой сериализатор: словарь из заранее объявленных полей.
+
+       Набор полей можно сузить через ?fields=, тогда из базы читаются
+       только нужные им колонки.
+    """
+
+    fields = {}
+    # Колонки, которые нужны всегда (например, для пагинации и ETag).
+    required_columns = ('id',)
+
+    def __init__(self, fields=None):
+        if not fields:
+            self.names = list(self.fields)
+            return
+        self.names = [name.strip() for name in fields.split(',')
+                      if name.strip()]
+        unknown = [name for name in self.names if name not in self.fields]
+        if unknown or not self.names:
+            raise InvalidFields(', '.join(unknown))
+
+    def project(self, queryset):
+        """Ограничивает запрос колонками выбранных полей."""
+
+        columns, related = set(self.required_columns), set()
+        for name in self.names:
+            field = self.fields[name]
+            columns.update(field.columns)
+            related.update(field.related)
+        if related:
+            # Без аргументов select_related() подтянул бы все связи.
+            queryset = queryset.select_related(*sorted(related))
+        return queryset.only(*columns)
+
+    def to_dict(self, obj):
+        return {name: self.fields[name].getter(obj) for name in self.names}
+
+    def to_list(self, objects):
+        return [self.to_dict(obj) for obj in objects]
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def _full_name(user):
+    return user.get_full_name() or user.username
+
+
+class PostSerializer(Serializer):
+    fields = {
+        'id': Field(('id',), (), lambda post: post.pk),
+        'text': Field(('text',), (), lambda post: post.text),
+        'pub_date': Field(('pub_date',), (),
+                          lambda post: _isoformat(post.pub_date)),
+        'modified': Field(('modified',), (),
+                          lambda post: _isoformat(post.modified)),
+        'author': Field(('author_id', 'author__username'), ('author',),
+                        lambda post: post.author.username),
+        'author_name': Field(
+            ('author_id', 'author__username', 'author__first_name',
+             'author__last_name'), ('author',),
+            lambda post: _full_name(post.author)),
+        'group': Field(('group_id', 'group__slug'), ('group',),
+                       lambda post: post.group and post.group.slug),
+        'group_title': Field(('group_id', 'group__title'), ('group',),
+                             lambda post: post.group and post.group.title),
+    }
+    # pub_date нужен курсору, modified — для ETag.
+    required_columns = ('id', 'pub_date', 'modified')
+
+
+class GroupSerializer(Serializer):
+    fields = {
+        'slug': Field(('slug',), (), lambda group: group.slug),
+        'title': Field(('title',), (), lambda group: group.title),
+        'description': Field(('description',), (),
+                             lambda group: group.description),
+        'posts_count': Field(('posts_count',), (),
+                             lambda group: group.posts_count),
+    }
+
+
+class ProfileSerializer(Serializer):
+    fields = {
+        'username': Field(('username',), (), lambda user: user.username),
+        'full_name': Field(('username', 'first_name', 'last_name'), (),
+                           _full_name),
+        'posts_count': Field(('profile__posts_count',), ('profile',),
+                             author_posts_count),
+    }
@@ -0,0 +1,188 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+@override_settings(PAGINATOR=2)
+class ApiViewsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth',
+                                            first_name='Лев',
+                                            last_name='Толстой')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.posts = [
+            Post.objects.create(author=cls.user, text=f'Пост {number}',
+                                group=cls.group if number % 2 else None)
+            for number in range(5)
+        ]
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_post_list_walks_all_pages(self):
+        """По ссылкам next обходятся все посты без повторов."""
+
+        url, ids = reverse('api:post_list'), []
+        while url:
+            data = self.guest_client.get(url).json()
+            ids += [post['id'] for post in data['results']]
+            url = data['next']
+        self.assertEqual(ids, [post.pk for post in reversed(self.posts)])
+
+    def test_post_fields(self):
+        """Пост сериализуется со всеми полями по умолчанию."""
+
+        post = self.guest_client.get(
+            reverse('api:post_list')).json()['results'][1]
+        self.assertEqual(post['text'], 'Пост 3')
+        self.assertEqual(post['author'], 'auth')
+        self.assertEqual(post['author_name'], 'Лев Толстой')
+        self.assertEqual(post['group'], self.group.slug)
+        self.assertEqual(post['group_title'], self.group.title)
+
+    def test_sparse_fields(self):
+        """?fields= оставляет только запрошенные поля и не делает JOIN."""
+
+        url = reverse('api:post_list')
+        with self.assertNumQueries(1) as context:
+            data = self.guest_client.get(url, {'fields': 'id,text'}).json()
+        self.assertEqual(set(data['results'][0]), {'id', 'text'})
+        self.assertNotIn('JOIN', context.captured_queries[0]['sql'])
+        self.assertIn('fields=id%2Ctext', data['next'])
+
+        response = self.guest_client.get(url, {'fields': 'id,password'})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_group_posts(self):
+        """Посты группы отдаются вместе с самой группой."""
+
+        data = self.guest_client.get(
+            reverse('api:group_posts', args=(self.group.slug,))).json()
+        self.assertEqual(data['group']['title'], self.group.title)
+        self.assertEqual(data['group']['posts_count'], 2)
+        self.assertEqual([post['id'] for post in data['results']],
+                         [self.posts[3].pk, self.posts[1].pk])
+
+    def test_profile(self):
+        """Профиль автора содержит счётчик и ссылку на его посты."""
+
+        data = self.guest_client.get(
+            reverse('api:profile', args=(self.user.username,))).json()
+        self.assertEqual(data['full_name'], 'Лев Толстой')
+        self.assertEqual(data['posts_count'], 5)
+        posts = self.guest_client.get(data['posts']).json()
+        self.assertEqual(len(posts['results']), 2)
+
+    def test_profile_without_profile_row(self):
+        User.objects.bulk_create([User(username='bulk')])
+        response = self.guest_client.get(
+            reverse('api:profile', args=('bulk',)))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json()['posts_count'], 0)
+
+    def test_not_found_and_bad_cursor(self):
+        """Ошибки отдаются в JSON с нужным статусом."""
+
+        cases = {
+            reverse('api:group_posts', args=('missing',)):
+                HTTPStatus.NOT_FOUND,
+            reverse('api:profile', args=('missing',)): HTTPStatus.NOT_FOUND,
+            reverse('api:post_list') + '?cursor=bad': HTTPStatus.BAD_REQUEST,
+        }
+        for url, status in cases.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, status)
+                self.assertIn('detail', response.json())
+
+    def test_etag(self):
+        """С актуальным ETag API отвечает 304."""
+
+        for url in (reverse('api:post_list'),
+                    reverse('api:group_posts', args=(self.group.slug,)),
+                    reverse('api:profile', args=(self.user.username,))):
+            with self.subTest(url=url):
+                etag = self.guest_client.get(url)['ETag']
+                response = self.guest_client.get(url,
+                                                 HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code,
+                                 HTTPStatus.NOT_MODIFIED)
+
+    def get_after_change(self, urls, change):
+        """Ответы на условные GET с ETag, полученными до change()."""
+
+        etags = {url: self.guest_client.get(url)['ETag'] for url in urls}
+        change()
+        return {url: self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+                for url, etag in etags.items()}
+
+    def test_author_rename_changes_etag(self):
+        """После смены имени автора посты отдаются заново."""
+
+        def rename():
+            author = User.objects.get(pk=self.user.pk)
+            author.first_name = 'Алексей'
+            author.save()
+
+        urls = (reverse('api:post_list'),
+                reverse('api:post_list') + '?author=auth',
+                reverse('api:group_posts', args=(self.group.slug,)))
+        for url, response in self.get_after_change(urls, rename).items():
+            with self.subTest(url=url):
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertEqual(response.json()['results'][0]['author_name'],
+                                 'Алексей Толстой')
+
+    def test_group_rename_changes_etag(self):
+        """После переименования группы посты отдаются заново."""
+
+        def rename():
+            group = Group.objects.get(pk=self.group.pk)
+            group.title = 'Новое название'
+            group.save()
+
+        urls = (reverse('api:post_list'),
+                reverse('api:post_list') + '?author=auth',
+                reverse('api:group_posts', args=(self.group.slug,)))
+        for url, response in self.get_after_change(urls, rename).items():
+            with self.subTest(url=url):
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                titles = {post['group_title']
+                          for post in response.json()['results']}
+                self.assertIn('Новое название', titles)
+
+    @override_settings(GROUP_AUTOCOMPLETE_LIMIT=1)
+    def test_group_search(self):
+        """Группы ищутся по части названия без учёта регистра."""
+
+        cache.clear()
+        Group.objects.create(title='Другая группа', slug='other',
+                             description='')
+        url = reverse('api:group_search')
+        data = self.guest_client.get(url, {'q': 'ТЕСТОВАЯ'}).json()
+        self.assertEqual(data['results'],
+                         [{'id': self.group.pk, 'title': self.group.title}])
+        self.assertEqual(
+            len(self.guest_client.get(url, {'q': 'группа'}).json()['results']),
+            1)
+        self.assertEqual(
+            self.guest_client.get(url, {'q': 'нет такой'}).json()['results'],
+            [])
+
+    def test_read_only(self):
+        response = self.guest_client.post(reverse('api:post_list'))
+        self.assertEqual(response.status_code,
+                         HTTPStatus.METHOD_NOT_ALLOWED)
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from api.views import group_posts, group_search, post_list, profile
+
+app_name = 'api'
+urlpatterns = [
+    path('posts/', post_list, name='post_list'),
+    path('groups/', group_search, name='group_search'),
+    path('groups/<slug:slug>/posts/', group_posts, name='group_posts'),
+    path('profiles/<str:username>/', profile, name='profile'),
+]
@@ -0,0 +1,131 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import JsonResponse
+from django.urls import reverse
+from django.utils.http import urlencode
+from django.views.decorators.http import require_GET
+
+from posts.cache import INDEX_FEED, author_feed, get_feed_version, group_feed
+from posts.groups import search_groups
+from posts.models import Group, Post
+from posts.paginators import CursorPaginator, InvalidCursor
+from posts.utils import (make_validators, not_modified, page_validators,
+                         with_validators)
+
+from .serializers import (GroupSerializer, InvalidFields, PostSerializer,
+                          ProfileSerializer)
+
+User = get_user_model()
+
+
+def json_response(data, status=200):
+    return JsonResponse(data, status=status,
+                        json_dumps_params={'ensure_ascii': False})
+
+
+def error(status, detail):
+    return json_response({'detail': detail}, status=status)
+
+
+def page_url(request, cursor):
+    """Ссылка на соседнюю страницу с теми же параметрами запроса."""
+
+    if cursor is None:
+        return None
+    params = request.GET.copy()
+    params['cursor'] = cursor
+    return request.build_absolute_uri(
+        f'{request.path}?{urlencode(sorted(params.items()))}')
+
+
+def posts_response(request, queryset, feed, extra=None):
+    """Страница постов в JSON с курсорами и ETag.
+
+       Версия ленты feed входит в ETag: её сбрасывают и изменения,
+       которых не видно по постам страницы (имя автора, название группы).
+       extra — дополнительные данные ответа (например, группа).
+    """
+
+    try:
+        serializer = PostSerializer(request.GET.get('fields'))
+    except InvalidFields as exc:
+        return error(400, f'Неизвестные поля: {exc}')
+    paginator = CursorPaginator(serializer.project(queryset),
+                                settings.PAGINATOR)
+    try:
+        page_obj = paginator.page(request.GET.get('cursor'))
+    except InvalidCursor:
+        return error(400, 'Неверный курсор.')
+    validators = page_validators(request, page_obj, get_feed_version(feed),
+                                 serializer.names, extra)
+    response = not_modified(request, validators)
+    if response is not None:
+        return response
+    data = dict(extra or {})
+    data.update({
+        'next': page_url(request, page_obj.next_cursor),
+        'previous': page_url(request, page_obj.previous_cursor),
+        'results': serializer.to_list(page_obj),
+    })
+    return with_validators(json_response(data), validators)
+
+
+@require_GET
+def post_list(request):
+    """Все посты, новые первыми; ?author= оставляет посты одного автора."""
+
+    queryset = Post.objects.all()
+    feed = INDEX_FEED
+    author = request.GET.get('author')
+    if author:
+        author_id = User.objects.filter(username=author).values_list(
+            'pk', flat=True).first()
+        queryset = queryset.filter(author_id=author_id)
+        if author_id is not None:
+            feed = author_feed(author_id)
+    return posts_response(request, queryset, feed)
+
+
+@require_GET
+def group_posts(request, slug):
+    """Посты группы вместе с описанием самой группы."""
+
+    serializer = GroupSerializer()
+    group = serializer.project(Group.objects.filter(slug=slug)).first()
+    if group is None:
+        return error(404, 'Группа не найдена.')
+    return posts_response(request, Post.objects.filter(group=group),
+                          group_feed(group.pk),
+                          {'group': serializer.to_dict(group)})
+
+
+@require_GET
+def profile(request, username):
+    """Профиль автора со ссылкой на его посты."""
+
+    try:
+        serializer = ProfileSerializer(request.GET.get('fields'))
+    except InvalidFields as exc:
+        return error(400, f'Неизвестные поля: {exc}')
+    queryset = serializer.project(User.objects.filter(username=username))
+    author = queryset.first()
+    if author is None:
+        return error(404, 'Автор не найден.')
+    data = serializer.to_dict(author)
+    data['posts'] = request.build_absolute_uri(
+        f"{reverse('api:post_list')}?{urlencode({'author': username})}")
+    validators = make_validators(request, (), sorted(data.items()))
+    response = not_modified(request, validators)
+    if response is not None:
+        return response
+    return with_validators(json_response(data), validators)
+
+
+@require_GET
+def group_search(request):
+    """Автодополнение групп по части названия: ?q=."""
+
+    query = request.GET.get('q', '').strip()
+    groups = search_groups(query, settings.GROUP_AUTOCOMPLETE_LIMIT)
+    return json_response({'results': [{'id': pk, 'title': title}
+                                      for pk, title in groups]})
@@ -0,0 +1,133 @@
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from benchmarks.seed import seed
+from posts.models import Post
+
+# Стандартный SQLite против боевых настроек SQLITE_TUNED_PRAGMAS.
+DEFAULT_PRAGMAS = {'journal_mode': 'DELETE', 'synchronous': 'FULL'}
+
+
+class Counts(dict):
+    """Счётчики операций, общие для потоков."""
+
+    def __init__(self):
+        super().__init__(reads=0, writes=0, errors=0)
+        self._lock = threading.Lock()
+
+    def add(self, key):
+        with self._lock:
+            self[key] += 1
+
+
+def read_feed(deadline, counts):
+    while time.monotonic() < deadline:
+        try:
+            list(Post.objects.feed()[:10])
+            counts.add('reads')
+        except OperationalError:
+            counts.add('errors')
+
+
+def write_posts(deadline, counts, author):
+    while time.monotonic() < deadline:
+        try:
+            Post.objects.create(author=author, text='Конкурентная запись')
+            counts.add('writes')
+        except OperationalError:
+            counts.add('errors')
+
+
+def run(target, *args):
+    """Запускает target в потоке и закрывает соединение потока."""
+
+    try:
+        target(*args)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = ('Замеряет чтение ленты под одновременной записью постов '
+            'и время запросов без сохранения соединений и с ним. '
+            'Работает на временной копии базы.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--duration', type=float, default=3.0)
+        parser.add_argument('--posts', type=int, default=2000)
+        parser.add_argument('--requests', type=int, default=200)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            self.stderr.write('Бенчмарк рассчитан на SQLite.')
+            return
+        old_name = connection.settings_dict['NAME']
+        directory = tempfile.mkdtemp()
+        connection.settings_dict['TEST'] = dict(
+            connection.settings_dict.get('TEST') or {},
+            NAME=os.path.join(directory, 'bench.sqlite3'))
+        connection.creation.create_test_db(verbosity=0, autoclobber=True,
+                                           serialize=False)
+        try:
+            dataset = seed(users=20, groups=5, posts=options['posts'],
+                           index_search=False)
+            profiles = {
+                'По умолчанию (DELETE, FULL)': DEFAULT_PRAGMAS,
+                'SQLITE_TUNED_PRAGMAS': settings.SQLITE_TUNED_PRAGMAS,
+            }
+            for title, pragmas in profiles.items():
+                self.stdout.write(self.style.MIGRATE_HEADING(title))
+                with override_settings(SQLITE_PRAGMAS=pragmas):
+                    connections.close_all()
+                    self.report_concurrency(dataset, options)
+            self.report_reuse(dataset, options['requests'])
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            os.rmdir(directory)
+
+    def report_concurrency(self, dataset, options):
+        deadline = time.monotonic() + options['duration']
+        counts = Counts()
+        threads = (
+            [threading.Thread(target=run, args=(read_feed, deadline, counts))
+             for _ in range(options['readers'])]
+            + [threading.Thread(target=run,
+                                args=(write_posts, deadline, counts,
+                                      dataset.author))
+               for _ in range(options['writers'])]
+        )
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duration = options['duration']
+        self.stdout.write(
+            f'  чтений {counts["reads"] / duration:.0f}/с, '
+            f'записей {counts["writes"] / duration:.0f}/с, '
+            f'ошибок блокировки {counts["errors"]}'
+        )
+
+    def report_reuse(self, dataset, requests):
+        self.stdout.write(self.style.MIGRATE_HEADING('Соединения'))
+        url = reverse('posts:post_detail', args=(dataset.post.pk,))
+        client = Client()
+        for max_age in (0, 60):
+            connections.close_all()
+            connection.settings_dict['CONN_MAX_AGE'] = max_age
+            start = time.perf_counter()
+            for _ in range(requests):
+                client.get(url)
+            per_request = (time.perf_counter() - start) * 1000 / requests
+            self.stdout.write(
+                f'  CONN_MAX_AGE={max_age}: {per_request:.2f} мс на запрос')
@@ -0,0 +1,73 @@
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+
+from benchmarks.seed import seed
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = ('Наполняет базу тестовыми постами и замеряет ленты '
+            'с индексами и без них. Все изменения откатываются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--authors', type=int, default=50)
+        parser.add_argument('--groups', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        # SQLite позволяет удалять индексы в транзакции только
+        # с выключенной проверкой внешних ключей.
+        with connection.constraint_checks_disabled(), transaction.atomic():
+            dataset = seed(users=options['authors'],
+                           groups=options['groups'],
+                           posts=options['posts'],
+                           batch_size=options['batch_size'],
+                           index_search=False)
+            self.stdout.write(f'Создано постов: {options["posts"]}')
+            author, group = dataset.author, dataset.group
+            views = {
+                'index': (reverse('posts:index'), Post.objects.feed()),
+                'group_posts': (
+                    reverse('posts:group_list', args=(group.slug,)),
+                    Post.objects.feed().filter(group=group),
+                ),
+                'profile': (
+                    reverse('posts:profile', args=(author.username,)),
+                    Post.objects.feed().filter(author=author),
+                ),
+            }
+            self.report('С индексами', views, options['repeat'])
+            with connection.schema_editor() as editor:
+                for index in Post._meta.indexes:
+                    editor.remove_index(Post, index)
+            self.report('Без индексов', views, options['repeat'])
+            transaction.set_rollback(True)
+
+    def report(self, title, views, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        client = Client()
+        for name, (url, queryset) in views.items():
+            self.stdout.write(self.style.MIGRATE_LABEL(f'{name} {url}'))
+            self.stdout.write('  план страницы:')
+            self.stdout.write(queryset[:10].explain())
+            self.stdout.write('  план подсчёта:')
+            self.stdout.write(queryset.order_by().values('pk').explain())
+            timings = []
+            for _ in range(repeat):
+                # Меряем холодную страницу: кеш лент не должен помогать.
+                cache.clear()
+                start = time.perf_counter()
+                client.get(url, {'page': 2})
+                timings.append((time.perf_counter() - start) * 1000)
+            self.stdout.write(
+                f'  медиана {statistics.median(timings):.2f} мс, '
+                f'максимум {max(timings):.2f} мс'
+            )
@@ -0,0 +1,51 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template import Template, engines
+from django.template.context import Context
+
+# Прежний вариант шаблона: ссылка на каждую страницу.
+FULL_RANGE_TEMPLATE = (
+    '\n{% for i in page_obj.paginator.page_range %}\n'
+    '  <li class="page-item">'
+    '<a class="page-link" href="?page={{ i }}">{{ i }}</a></li>\n'
+    '{% endfor %}\n'
+)
+
+
+class Command(BaseCommand):
+    help = ('Замеряет отрисовку пагинатора при разном числе страниц: '
+            'полный список номеров против окна вокруг текущей.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, nargs='+',
+                            default=[10, 1000, 10000, 100000])
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        elided = engines['django'].get_template(
+            'posts/includes/paginator.html')
+        full = Template(FULL_RANGE_TEMPLATE)
+        self.stdout.write(f'{"страниц":>10} {"окно, мс":>10} '
+                          f'{"полный, мс":>11} {"окно, байт":>11}')
+        for num_pages in options['pages']:
+            paginator = Paginator(range(num_pages * 10), 10)
+            page_obj = paginator.page(num_pages // 2 or 1)
+            context = {'page_obj': page_obj}
+            elided_ms = self.measure(
+                lambda: elided.render(context), options['repeat'])
+            full_ms = self.measure(
+                lambda: full.render(Context(context)), options['repeat'])
+            size = len(elided.render(context).encode())
+            self.stdout.write(f'{num_pages:>10} {elided_ms:>10.3f} '
+                              f'{full_ms:>11.3f} {size:>11}')
+
+    def measure(self, render, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
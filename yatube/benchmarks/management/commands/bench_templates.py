@@ -0,0 +1,57 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template import engines
+
+from benchmarks.seed import seed
+from posts.models import Post
+
+# Цикл ленты и заголовок поста: как они отрисовывались до появления
+# text_html и title и как отрисовываются сейчас.
+TEMPLATES = {
+    'фильтры при отрисовке': (
+        '{% for post in posts %}<h2>{{ post.text|truncatechars:30 }}</h2>'
+        '<p>{{ post.text|linebreaksbr }}</p>{% endfor %}'
+    ),
+    'готовые text_html и title': (
+        '{% for post in posts %}<h2>{{ post.title }}</h2>'
+        '<p>{{ post.text_html|safe }}</p>{% endfor %}'
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает время отрисовки страницы постов с фильтрами '
+            'linebreaksbr/truncatechars и с заранее отрисованным HTML. '
+            'Все изменения откатываются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=10)
+        parser.add_argument('--words', type=int, default=200,
+                            help='Примерная длина поста в словах.')
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, **options):
+        engine = engines['django']
+        with transaction.atomic():
+            seed(users=3, groups=1, posts=options['page_size'],
+                 index_search=False)
+            posts = list(Post.objects.all()[:options['page_size']])
+            for post in posts:
+                # Длинные многострочные посты, как в реальной ленте.
+                post.text = '\n'.join([post.text] * (options['words'] // 30))
+                post.render()
+            for title, source in TEMPLATES.items():
+                template = engine.from_string(source)
+                timings = []
+                for _ in range(options['repeat']):
+                    start = time.perf_counter()
+                    template.render({'posts': posts})
+                    timings.append((time.perf_counter() - start) * 1000)
+                self.stdout.write(
+                    f'{title}: медиана {statistics.median(timings):.3f} мс '
+                    f'на страницу из {len(posts)} постов'
+                )
+            transaction.set_rollback(True)
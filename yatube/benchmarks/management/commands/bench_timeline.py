@@ -0,0 +1,98 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from benchmarks.seed import seed
+from posts.models import Follow, Post, TimelineEntry
+from posts.timeline import (backfill_timeline, fan_out, subscribed_posts,
+                            timeline_entries)
+
+User = get_user_model()
+
+
+def timed(func, repeat, setup=None):
+    """Медиана времени вызова func в миллисекундах.
+
+       setup вызывается перед каждым замером и в него не входит.
+    """
+
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает ленту подписок с раскладкой при записи '
+            '(fan-out on write) и сборкой при чтении (fan-out on read) '
+            'при разном числе подписчиков. Все изменения откатываются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--followers', type=int, nargs='+',
+                            default=[10, 100, 1000])
+        parser.add_argument('--following', type=int, default=20,
+                            help='На скольких авторов подписан читатель.')
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--page-size', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            dataset = seed(users=max(options['following'], 2), groups=5,
+                           posts=options['posts'],
+                           batch_size=options['batch_size'],
+                           index_search=False)
+            for followers in options['followers']:
+                self.report(dataset, followers, options)
+            transaction.set_rollback(True)
+
+    def report(self, dataset, followers, options):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Подписчиков у автора: {followers}'))
+        prefix = f'reader{time.time_ns()}'
+        password = make_password(None)
+        User.objects.bulk_create(
+            (User(username=f'{prefix}-{number}', password=password)
+             for number in range(followers)),
+            batch_size=options['batch_size'],
+        )
+        readers = list(User.objects.filter(username__startswith=prefix))
+        # Все читатели подписаны на автора, первый — ещё и на остальных.
+        authors = dataset.authors[:options['following']]
+        Follow.objects.bulk_create(
+            [Follow(user=reader, author=dataset.author)
+             for reader in readers]
+            + [Follow(user=readers[0], author=author) for author in authors
+               if author != dataset.author],
+            batch_size=options['batch_size'],
+        )
+        reader, size = readers[0], options['page_size']
+        backfill_timeline(reader)
+
+        post = Post.objects.filter(author=dataset.author).first()
+        write = timed(
+            lambda: fan_out(post), options['repeat'],
+            setup=lambda: TimelineEntry.objects.filter(post=post).delete())
+        read_on_write = timed(
+            lambda: list(timeline_entries(reader).order_by(
+                '-pub_date', '-id')[:size]),
+            options['repeat'])
+        read_on_read = timed(
+            lambda: list(subscribed_posts(reader).feed().order_by(
+                '-pub_date', '-id')[:size]),
+            options['repeat'])
+        self.stdout.write(
+            f'  fan-out on write: запись {write:.2f} мс, '
+            f'чтение {read_on_write:.2f} мс\n'
+            f'  fan-out on read:  запись 0.00 мс, '
+            f'чтение {read_on_read:.2f} мс'
+        )
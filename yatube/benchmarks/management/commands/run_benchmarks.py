@@ -0,0 +1,75 @@
+import json
+import platform
+import sys
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from benchmarks import runner
+from benchmarks.seed import seed
+
+
+class Command(BaseCommand):
+    help = ('Наполняет базу данными, прогоняет все страницы приложений '
+            'posts, users и about и выводит p50/p95/p99, число запросов '
+            'и размер ответа. Все изменения в базе откатываются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--groups', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--cold', action='store_true',
+                            help='очищать кеши перед каждым запросом')
+        parser.add_argument('--output', help='записать результат в JSON')
+        parser.add_argument('--compare',
+                            help='сравнить с JSON прошлого запуска')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            dataset = seed(users=options['users'], groups=options['groups'],
+                           posts=options['posts'],
+                           batch_size=options['batch_size'])
+            results = runner.run(dataset, options['repeat'],
+                                 options['cold'])
+            transaction.set_rollback(True)
+
+        report = {
+            'meta': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'argv': sys.argv[1:],
+                **{key: options[key] for key in
+                   ('users', 'groups', 'posts', 'repeat', 'cold')},
+            },
+            'routes': results,
+        }
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as file:
+                baseline = json.load(file)['routes']
+        self.print_table(results, baseline)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+
+    def print_table(self, results, baseline=None):
+        self.stdout.write(
+            f'{"маршрут":<32} {"код":>4} {"p50":>8} {"p95":>8} {"p99":>8} '
+            f'{"SQL":>4} {"байт":>8}'
+        )
+        for name, row in results.items():
+            line = (
+                f'{name:<32} {row["status"]:>4} {row["p50_ms"]:>8.2f} '
+                f'{row["p95_ms"]:>8.2f} {row["p99_ms"]:>8.2f} '
+                f'{row["queries"]:>4} {row["bytes"]:>8}'
+            )
+            if baseline and name in baseline:
+                old = baseline[name]
+                change = ((row['p95_ms'] - old['p95_ms'])
+                          / old['p95_ms'] * 100 if old['p95_ms'] else 0)
+                line += (f'  p95 {change:+.0f}%, '
+                         f'SQL {row["queries"] - old["queries"]:+d}')
+            self.stdout.write(line)
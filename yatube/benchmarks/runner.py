@@ -0,0 +1,106 @@
+import math
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+# Приложения, маршруты которых прогоняет бенчмарк.
+URLCONFS = ('posts.urls', 'users.urls', 'about.urls')
+# Параметры запроса для маршрутов, которым без них нечего показать.
+ROUTE_QUERIES = {'posts:search': '?q=кот'}
+
+
+def percentile(values, percent):
+    """Процентиль методом ближайшего ранга."""
+
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def route_kwargs(dataset):
+    """Значения параметров маршрутов для засеянных данных."""
+
+    return {
+        'slug': dataset.group.slug,
+        'username': dataset.author.username,
+        'post_id': dataset.post.pk,
+        'uidb64': urlsafe_base64_encode(force_bytes(dataset.author.pk)),
+        'token': default_token_generator.make_token(dataset.author),
+    }
+
+
+def collect_routes(dataset, urlconfs=URLCONFS):
+    """Все именованные маршруты приложений: {'posts:index': '/', ...}."""
+
+    values = route_kwargs(dataset)
+    routes = {}
+    for urlconf in urlconfs:
+        module = import_module(urlconf)
+        for pattern in module.urlpatterns:
+            if not isinstance(pattern, URLPattern) or not pattern.name:
+                continue
+            name = f'{module.app_name}:{pattern.name}'
+            kwargs = {key: values[key] for key in pattern.pattern.converters}
+            routes[name] = (reverse(name, kwargs=kwargs)
+                            + ROUTE_QUERIES.get(name, ''))
+    return routes
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+def measure_route(url, user, repeat, cold=False):
+    """Прогоняет GET-запросы к url и собирает время, запросы и размер.
+
+       Если аноним перенаправляется на страницу входа, запросы
+       выполняются от имени user. При cold=True кеши очищаются перед
+       каждым запросом.
+    """
+
+    client = Client()
+    response = client.get(url)
+    login_url = reverse(settings.LOGIN_URL)
+    needs_login = (response.status_code == 302
+                   and response.url.startswith(login_url))
+    timings, queries = [], []
+    for _ in range(repeat):
+        if needs_login:
+            # Вход вне замера: например, logout разлогинивает клиента.
+            client.force_login(user)
+        if cold:
+            clear_caches()
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            response = client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(len(context.captured_queries))
+    return {
+        'url': url,
+        'status': response.status_code,
+        'login': needs_login,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'queries': max(queries),
+        'bytes': len(response.content),
+    }
+
+
+def run(dataset, repeat=20, cold=False):
+    """Замеряет все маршруты приложений на засеянных данных."""
+
+    return {
+        name: measure_route(url, dataset.author, repeat, cold)
+        for name, url in collect_routes(dataset).items()
+    }
@@ -0,0 +1,65 @@
+import random
+import time
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+from posts.counters import recount_posts
+from posts.models import Group, Post
+from posts.search import get_search_backend
+
+User = get_user_model()
+
+Dataset = namedtuple('Dataset', 'authors groups author group post')
+
+WORDS = ('кот', 'собака', 'город', 'река', 'книга', 'музыка', 'утро',
+         'дорога', 'море', 'лес', 'работа', 'праздник')
+
+
+def random_post(authors, groups):
+    post = Post(text=' '.join(random.choices(WORDS, k=30)),
+                author=random.choice(authors),
+                group=random.choice(groups + [None]))
+    post.render()
+    return post
+
+
+def seed(users=50, groups=20, posts=10000, batch_size=500,
+         index_search=True):
+    """Наполняет базу пользователями, группами и постами через
+       bulk_create и приводит в порядок всё, что обычно делают сигналы.
+    """
+
+    prefix = f'bench{time.time_ns()}'
+    password = make_password(None)
+    User.objects.bulk_create(
+        (User(username=f'{prefix}-{number}', first_name='Автор',
+              last_name=str(number), password=password)
+         for number in range(users)),
+        batch_size=batch_size,
+    )
+    Group.objects.bulk_create(
+        (Group(title=f'Группа {number}', slug=f'{prefix}-{number}',
+               description='Описание группы')
+         for number in range(groups)),
+        batch_size=batch_size,
+    )
+    authors = list(User.objects.filter(username__startswith=prefix))
+    group_list = list(Group.objects.filter(slug__startswith=prefix))
+    Post.objects.bulk_create(
+        (random_post(authors, group_list) for _ in range(posts)),
+        batch_size=batch_size,
+    )
+    # bulk_create не вызывает сигналы: счётчики и индекс строим сами.
+    recount_posts()
+    if index_search:
+        get_search_backend().rebuild()
+    post = Post.objects.filter(author__in=authors).first()
+    return Dataset(
+        authors=authors,
+        groups=group_list,
+        author=post.author if post else authors[0],
+        group=group_list[0],
+        post=post,
+    )
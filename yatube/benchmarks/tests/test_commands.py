@@ -0,0 +1,40 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from posts.models import Post
+
+
+class RunBenchmarksTest(TestCase):
+    def test_run_benchmarks_writes_json(self):
+        """run_benchmarks замеряет все маршруты и откатывает данные."""
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'result.json')
+            call_command('run_benchmarks', users=3, groups=2, posts=30,
+                         repeat=2, output=path, stdout=StringIO())
+            with open(path) as file:
+                report = json.load(file)
+
+        routes = report['routes']
+        for name in ('posts:index', 'posts:post_edit', 'users:signup',
+                     'about:tech'):
+            with self.subTest(name=name):
+                self.assertEqual(routes[name]['status'], 200)
+                self.assertGreater(routes[name]['bytes'], 0)
+        self.assertTrue(routes['posts:post_create']['login'])
+        self.assertFalse(Post.objects.exists())
+
+
+class BenchTimelineTest(TestCase):
+    def test_bench_timeline_reports_both_strategies(self):
+        out = StringIO()
+        call_command('bench_timeline', followers=[3], following=2,
+                     posts=20, repeat=1, stdout=out)
+        self.assertIn('fan-out on write', out.getvalue())
+        self.assertIn('fan-out on read', out.getvalue())
+        self.assertFalse(Post.objects.exists())
@@ -0,0 +1,54 @@
+import logging
+
+from django.conf import settings
+from django.core.checks import Error, Warning, register
+
+CACHED_LOADER = 'django.template.loaders.cached.Loader'
+
+
+def uses_cached_loader():
+    """Все движки DjangoTemplates загружают шаблоны через кеш."""
+
+    for engine in settings.TEMPLATES:
+        if engine['BACKEND'] != ('django.template.backends.django.'
+                                 'DjangoTemplates'):
+            continue
+        loaders = engine.get('OPTIONS', {}).get('loaders', [])
+        if not any(isinstance(loader, (list, tuple))
+                   and loader[0] == CACHED_LOADER for loader in loaders):
+            return False
+    return True
+
+
+@register()
+def production_overhead(app_configs, **kwargs):
+    """Боевой профиль не должен запускаться с отладочными издержками."""
+
+    if settings.SETTINGS_PROFILE != 'prod':
+        return []
+    errors = []
+    if settings.DEBUG:
+        errors.append(Error(
+            'DEBUG включён в боевом профиле.',
+            hint='Каждый SQL-запрос копится в connection.queries.',
+            id='core.E001',
+        ))
+    if not uses_cached_loader():
+        errors.append(Error(
+            'Шаблоны загружаются без кеширующего загрузчика.',
+            hint=f'Добавьте {CACHED_LOADER} в TEMPLATES.',
+            id='core.E002',
+        ))
+    if logging.getLogger('django.db.backends').isEnabledFor(logging.DEBUG):
+        errors.append(Error(
+            'Логгер django.db.backends пишет каждый SQL-запрос.',
+            hint='Поднимите его уровень до WARNING в LOGGING.',
+            id='core.E003',
+        ))
+    if settings.TASKS_EAGER:
+        errors.append(Warning(
+            'Фоновые задачи выполняются внутри запросов.',
+            hint='Запустите run_worker и выключите TASKS_EAGER.',
+            id='core.W001',
+        ))
+    return errors
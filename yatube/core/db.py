@@ -0,0 +1,63 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+DEFAULT_DB = 'default'
+
+# Реплика, с которой читает текущий запрос; None — основная база.
+_replica_alias = ContextVar('replica_alias', default=None)
+
+
+def enable_replica_reads():
+    """Разрешает чтение с реплик в текущем контексте, возвращает токен
+       для reset_replica_reads.
+
+       Реплика выбирается один раз: все чтения запроса идут на неё, чтобы
+       количество и страница не пришли с реплик с разным отставанием.
+    """
+
+    alias = None
+    if settings.DATABASE_REPLICAS:
+        alias = random.choice(settings.DATABASE_REPLICAS)
+    return _replica_alias.set(alias)
+
+
+def reset_replica_reads(token):
+    _replica_alias.reset(token)
+
+
+@contextmanager
+def replica_reads():
+    """Разрешает чтение с реплик внутри блока."""
+
+    token = enable_replica_reads()
+    try:
+        yield
+    finally:
+        reset_replica_reads(token)
+
+
+def read_alias():
+    """База для чтения в текущем контексте."""
+
+    return _replica_alias.get() or DEFAULT_DB
+
+
+class ReplicaRouter:
+    """Отправляет чтение на реплики, если его разрешил
+       ReplicaRoutingMiddleware, а запись — всегда на основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Все базы — основная и её копии, даже если чтение с реплик
+        # сейчас выключено (как в тестах до override_settings).
+        databases = settings.DATABASES
+        return obj1._state.db in databases and obj2._state.db in databases
@@ -0,0 +1,146 @@
+import bisect
+import contextvars
+import threading
+import time
+from collections import defaultdict
+
+from django.template.backends import django as django_backend
+
+# Границы корзин гистограмм; последняя корзина — всё, что больше.
+DURATION_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576)
+
+_current_stats = contextvars.ContextVar('request_stats', default=None)
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами, безопасна для потоков."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0
+        self.sum = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += 1
+            self.sum += value
+
+    def as_dict(self):
+        with self._lock:
+            labels = [f'<={bound}' for bound in self.buckets]
+            labels.append(f'>{self.buckets[-1]}')
+            return {
+                'buckets': dict(zip(labels, self.counts)),
+                'count': self.total,
+                'sum': round(self.sum, 3),
+            }
+
+
+class ViewMetrics:
+    """Накопленные метрики одного view."""
+
+    def __init__(self):
+        self.duration_ms = Histogram(DURATION_BUCKETS_MS)
+        self.sql_ms = Histogram(DURATION_BUCKETS_MS)
+        self.render_ms = Histogram(DURATION_BUCKETS_MS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+        self.over_budget = 0
+        self._lock = threading.Lock()
+
+    def mark_over_budget(self):
+        with self._lock:
+            self.over_budget += 1
+
+    def as_dict(self):
+        return {
+            'duration_ms': self.duration_ms.as_dict(),
+            'sql_ms': self.sql_ms.as_dict(),
+            'render_ms': self.render_ms.as_dict(),
+            'queries': self.queries.as_dict(),
+            'response_bytes': self.response_bytes.as_dict(),
+            'over_budget': self.over_budget,
+        }
+
+
+class RequestStats:
+    """Метрики одного запроса: число и время SQL, время шаблонов."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.render_seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Вызывается как execute_wrapper для каждого SQL-запроса.
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - start
+            self.queries += 1
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._views = defaultdict(ViewMetrics)
+        self._lock = threading.Lock()
+
+    def view(self, name):
+        with self._lock:
+            return self._views[name]
+
+    def snapshot(self):
+        with self._lock:
+            views = dict(self._views)
+        return {name: metrics.as_dict() for name, metrics in views.items()}
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+registry = MetricsRegistry()
+
+
+def start_request():
+    """Начинает сбор метрик запроса в текущем контексте."""
+
+    stats = RequestStats()
+    return stats, _current_stats.set(stats)
+
+
+def finish_request(token):
+    _current_stats.reset(token)
+
+
+def install_template_timer():
+    """Оборачивает отрисовку шаблонов Django, чтобы учитывать её время.
+
+       Оборачивается только Template бэкенда: вложенные include
+       отрисовываются внутри него и дважды не считаются.
+    """
+
+    template_class = django_backend.Template
+    if getattr(template_class.render, 'timed', False):
+        return
+    original_render = template_class.render
+
+    def render(self, context=None, request=None):
+        stats = _current_stats.get()
+        if stats is None:
+            return original_render(self, context, request)
+        start = time.perf_counter()
+        try:
+            return original_render(self, context, request)
+        finally:
+            stats.render_seconds += time.perf_counter() - start
+
+    render.timed = True
+    template_class.render = render
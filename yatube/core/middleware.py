@@ -0,0 +1,104 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from . import metrics
+from .db import enable_replica_reads, reset_replica_reads
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetricsMiddleware:
+    """Считает для каждого запроса SQL-запросы и их время, время
+       отрисовки шаблонов и размер ответа.
+
+       Итоги отдаются в заголовке Server-Timing и копятся в гистограммах
+       core.metrics.registry по имени view. Запросы сверх бюджета
+       REQUEST_QUERY_BUDGETS попадают в лог.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        metrics.install_template_timer()
+
+    def __call__(self, request):
+        if not settings.REQUEST_METRICS_ENABLED:
+            return self.get_response(request)
+
+        stats, token = metrics.start_request()
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(stats))
+                response = self.get_response(request)
+        finally:
+            metrics.finish_request(token)
+        duration_ms = (time.perf_counter() - start) * 1000
+        sql_ms = stats.sql_seconds * 1000
+        render_ms = stats.render_seconds * 1000
+
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={sql_ms:.2f};desc="{stats.queries} queries"',
+            f'render;dur={render_ms:.2f}',
+            f'total;dur={duration_ms:.2f}',
+        ))
+
+        match = request.resolver_match
+        view_name = match.view_name if match else 'unresolved'
+        view_metrics = metrics.registry.view(view_name)
+        view_metrics.duration_ms.observe(duration_ms)
+        view_metrics.sql_ms.observe(sql_ms)
+        view_metrics.render_ms.observe(render_ms)
+        view_metrics.queries.observe(stats.queries)
+        if not response.streaming:
+            view_metrics.response_bytes.observe(len(response.content))
+
+        budget = settings.REQUEST_QUERY_BUDGETS.get(
+            view_name, settings.REQUEST_QUERY_BUDGET_DEFAULT)
+        if budget is not None and stats.queries > budget:
+            view_metrics.mark_over_budget()
+            logger.warning(
+                '%s: %d SQL-запросов при бюджете %d (%s)',
+                view_name, stats.queries, budget, request.path,
+            )
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """Разрешает view из REPLICA_READ_VIEWS читать с реплик.
+
+       После запроса на запись сессия на REPLICA_STICKY_SECONDS
+       привязывается к основной базе, чтобы пользователь сразу видел
+       свои изменения, даже если реплика отстаёт.
+    """
+
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+    SESSION_KEY = '_primary_db_until'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.replica_token = None
+        try:
+            response = self.get_response(request)
+        finally:
+            if request.replica_token is not None:
+                reset_replica_reads(request.replica_token)
+        if (settings.DATABASE_REPLICAS
+                and request.method not in self.SAFE_METHODS):
+            request.session[self.SESSION_KEY] = (
+                time.time() + settings.REPLICA_STICKY_SECONDS)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (settings.DATABASE_REPLICAS
+                and request.method in self.SAFE_METHODS
+                and request.resolver_match.view_name
+                in settings.REPLICA_READ_VIEWS
+                and request.session.get(self.SESSION_KEY, 0) < time.time()):
+            request.replica_token = enable_replica_reads()
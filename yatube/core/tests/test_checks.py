@@ -0,0 +1,36 @@
+import copy
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from core.checks import CACHED_LOADER, production_overhead
+
+
+def cached_templates():
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]['APP_DIRS'] = False
+    templates[0]['OPTIONS']['loaders'] = [
+        (CACHED_LOADER, ['django.template.loaders.filesystem.Loader']),
+    ]
+    return templates
+
+
+class ProductionOverheadCheckTest(SimpleTestCase):
+    def check_ids(self):
+        return [message.id for message in production_overhead(None)]
+
+    def test_other_profiles_are_not_checked(self):
+        with override_settings(SETTINGS_PROFILE='dev', DEBUG=True):
+            self.assertEqual(self.check_ids(), [])
+
+    def test_tuned_prod_passes(self):
+        with override_settings(SETTINGS_PROFILE='prod', DEBUG=False,
+                               TEMPLATES=cached_templates(),
+                               TASKS_EAGER=False):
+            self.assertEqual(self.check_ids(), [])
+
+    def test_prod_with_debug_overhead_fails(self):
+        with override_settings(SETTINGS_PROFILE='prod', DEBUG=True,
+                               TASKS_EAGER=True):
+            self.assertEqual(self.check_ids(),
+                             ['core.E001', 'core.E002', 'core.W001'])
@@ -0,0 +1,98 @@
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.db import ReplicaRouter, replica_reads
+from posts.models import Post
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class ReplicaRouterTest(TestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_reads_go_to_replica_only_when_allowed(self):
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Post), 'replica1')
+            self.assertEqual(self.router.db_for_write(Post), 'default')
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    @override_settings(DATABASE_REPLICAS=['replica1', 'replica2'])
+    def test_replica_is_chosen_once(self):
+        """Все чтения в контексте идут на одну и ту же реплику."""
+
+        for _ in range(10):
+            with replica_reads():
+                aliases = {self.router.db_for_read(Post) for _ in range(20)}
+            self.assertEqual(len(aliases), 1)
+
+
+# Реплики здесь нет: выбранный алиас подменяется на default,
+# а сам факт выбора реплики записывается.
+@override_settings(DATABASE_REPLICAS=['replica1'])
+@mock.patch('core.db.random.choice', return_value='default')
+class ReplicaRoutingMiddlewareTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_read_views_use_replica(self, choice):
+        self.client.get(reverse('posts:index'))
+        self.assertTrue(choice.called)
+
+    def test_other_views_use_primary(self, choice):
+        self.client.get(reverse('posts:post_create'))
+        self.assertFalse(choice.called)
+
+    def test_session_sticks_to_primary_after_write(self, choice):
+        """После записи автор читает с основной базы и видит свой пост."""
+
+        self.client.post(reverse('posts:post_create'), {'text': 'Новый'})
+        response = self.client.get(reverse('posts:index'))
+        self.assertFalse(choice.called)
+        self.assertContains(response, 'Новый')
+
+        with override_settings(REPLICA_STICKY_SECONDS=-1):
+            self.client.post(reverse('posts:post_create'), {'text': 'Ещё'})
+        self.client.get(reverse('posts:index'))
+        self.assertTrue(choice.called)
+
+
+# Запуск с двумя локальными SQLite-базами:
+# TEST_DATABASE_REPLICAS=/tmp/replica.sqlite3 python manage.py test core
+# Реплики в тестах — отдельные пустые базы, то есть «отставшие» копии.
+@skipUnless(getattr(settings, 'TEST_DATABASE_REPLICAS', None),
+            'нужны реплики: TEST_DATABASE_REPLICAS=путь1,путь2')
+@override_settings(DATABASE_REPLICAS=getattr(
+    settings, 'TEST_DATABASE_REPLICAS', []))
+class ReplicaIntegrationTest(TestCase):
+    databases = '__all__'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='auth')
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_post_is_visible_to_author_before_replication(self):
+        url = reverse('posts:profile', args=(self.user.username,))
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        self.client.post(reverse('posts:post_create'), {'text': 'Новый'})
+        self.assertContains(self.client.get(url), 'Новый')
+        for alias in settings.DATABASE_REPLICAS:
+            with self.subTest(alias=alias):
+                self.assertFalse(Post.objects.using(alias).exists())
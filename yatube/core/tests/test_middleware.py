@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+
+from core.metrics import registry
+
+User = get_user_model()
+
+
+@override_settings(REQUEST_METRICS_ENABLED=True)
+class RequestMetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.guest_client = Client()
+
+    def test_server_timing_header(self):
+        response = self.guest_client.get('/about/author/')
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('render;dur=', response['Server-Timing'])
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+    def test_metrics_are_aggregated_by_view(self):
+        for _ in range(3):
+            self.guest_client.get('/about/tech/')
+        snapshot = registry.snapshot()['about:tech']
+        self.assertEqual(snapshot['duration_ms']['count'], 3)
+        self.assertGreater(snapshot['render_ms']['sum'], 0)
+        self.assertGreater(snapshot['response_bytes']['sum'], 0)
+
+    @override_settings(REQUEST_QUERY_BUDGETS={'posts:index': 0})
+    def test_query_budget_is_reported(self):
+        with self.assertLogs('core.middleware', level='WARNING') as logs:
+            self.guest_client.get('/')
+        self.assertIn('posts:index', logs.output[0])
+        self.assertEqual(registry.snapshot()['posts:index']['over_budget'],
+                         1)
+
+    @override_settings(REQUEST_METRICS_ENABLED=False)
+    def test_metrics_can_be_disabled(self):
+        response = self.guest_client.get('/about/author/')
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_metrics_view_is_for_staff_only(self):
+        self.guest_client.get('/about/author/')
+        response = self.guest_client.get('/core/metrics/')
+        self.assertEqual(response.status_code, 302)
+
+        staff = User.objects.create_user(username='staff', is_staff=True)
+        self.guest_client.force_login(staff)
+        response = self.guest_client.get('/core/metrics/')
+        self.assertIn('about:author', response.json())
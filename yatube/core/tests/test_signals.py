@@ -0,0 +1,26 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.db import connections
+from django.test import SimpleTestCase, override_settings
+
+
+class SqlitePragmasTest(SimpleTestCase):
+    @override_settings(SQLITE_PRAGMAS=settings.SQLITE_TUNED_PRAGMAS)
+    def test_new_connection_is_tuned(self):
+        """Новое соединение с файловой базой работает в режиме WAL."""
+
+        with tempfile.TemporaryDirectory() as directory:
+            settings_dict = dict(connections['default'].settings_dict,
+                                 NAME=os.path.join(directory, 'db.sqlite3'))
+            wrapper = connections['default'].__class__(settings_dict,
+                                                       alias='pragmas')
+            try:
+                with wrapper.cursor() as cursor:
+                    cursor.execute('PRAGMA journal_mode')
+                    self.assertEqual(cursor.fetchone()[0], 'wal')
+                    cursor.execute('PRAGMA synchronous')
+                    self.assertEqual(cursor.fetchone()[0], 1)
+            finally:
+                wrapper.close()
@@ -0,0 +1,35 @@
+from django.core.paginator import Paginator
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase
+
+from core.templatetags.paginator_tags import elided_page_range
+
+
+class ElidedPageRangeTests(SimpleTestCase):
+    def page(self, number, num_pages):
+        return Paginator(range(num_pages * 10), 10).page(number)
+
+    def test_few_pages_are_not_elided(self):
+        self.assertEqual(elided_page_range(self.page(3, 7)),
+                         [1, 2, 3, 4, 5, 6, 7])
+
+    def test_window_around_current_page(self):
+        self.assertEqual(elided_page_range(self.page(50, 100)),
+                         [1, None, 48, 49, 50, 51, 52, None, 100])
+
+    def test_window_near_edges(self):
+        self.assertEqual(elided_page_range(self.page(2, 100)),
+                         [1, 2, 3, 4, None, 100])
+        self.assertEqual(elided_page_range(self.page(99, 100)),
+                         [1, None, 97, 98, 99, 100])
+
+    def test_paginator_size_does_not_depend_on_num_pages(self):
+        """Разметка пагинатора не растёт вместе с числом страниц."""
+
+        items = {
+            render_to_string('posts/includes/paginator.html',
+                             {'page_obj': self.page(50, num_pages)}
+                             ).count('<li')
+            for num_pages in (100, 10000)
+        }
+        self.assertEqual(len(items), 1)
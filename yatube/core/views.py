@@ -0,0 +1,12 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+from .metrics import registry
+
+
+@staff_member_required
+def metrics(request):
+    """Накопленные метрики запросов по каждому view."""
+
+    return JsonResponse(registry.snapshot(),
+                        json_dumps_params={'ensure_ascii': False})
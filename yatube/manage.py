@@ -4,6 +4,9 @@ import sys
 
 
 def main():
+    # Профиль настроек: YATUBE_ENV=dev|test|prod, для тестов — test.
+    os.environ.setdefault('YATUBE_ENV',
+                          'test' if sys.argv[1:2] == ['test'] else 'dev')
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
     try:
         from django.core.management import execute_from_command_line
@@ -0,0 +1,100 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .paginators import count_cache_key
+
+INDEX_FEED = 'index'
+
+
+def group_feed(group_id):
+    return f'group:{group_id}'
+
+
+def author_feed(author_id):
+    return f'author:{author_id}'
+
+
+def get_feed_cache():
+    return caches[settings.FEED_CACHE_ALIAS]
+
+
+def _version_key(feed):
+    return f'feed-version:{feed}'
+
+
+def get_feed_version(feed):
+    """Текущая версия ленты: входит в ключи всех её страниц."""
+
+    cache = get_feed_cache()
+    version = cache.get(_version_key(feed))
+    if version is None:
+        # Начальная версия от времени, чтобы после вытеснения ключа
+        # не вернуться к уже использованной версии.
+        version = time.time_ns()
+        if not cache.add(_version_key(feed), version, None):
+            version = cache.get(_version_key(feed), version)
+    return version
+
+
+def after_commit(func):
+    """Вызывает func сейчас и, внутри транзакции, ещё раз после коммита.
+
+       Иначе конкурентный запрос успеет прочитать ещё не изменённые
+       данные и закешировать их под уже новой версией.
+    """
+
+    func()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(func)
+
+
+def _bump_versions(feeds):
+    cache = get_feed_cache()
+    for feed in feeds:
+        try:
+            cache.incr(_version_key(feed))
+        except ValueError:
+            cache.set(_version_key(feed), time.time_ns(), None)
+
+
+def invalidate_feeds(*feeds):
+    """Сбрасывает все закешированные страницы перечисленных лент."""
+
+    feeds = set(feeds)
+    after_commit(lambda: _bump_versions(feeds))
+
+
+def change_feed_counts(feeds, delta):
+    """Меняет закешированное количество постов в лентах на delta.
+
+       Если количество не закешировано, его посчитает CachedCountPaginator.
+    """
+
+    cache = get_feed_cache()
+    for feed in feeds:
+        try:
+            cache.incr(count_cache_key(feed), delta)
+        except ValueError:
+            pass
+
+
+def forget_feed_counts(*feeds):
+    """Удаляет закешированное количество постов лент."""
+
+    get_feed_cache().delete_many([count_cache_key(feed) for feed in feeds])
+
+
+def feed_cache(feed, page_obj):
+    """Параметры тега {% cache %} для страницы ленты."""
+
+    page = getattr(page_obj, 'number', None)
+    if page is None:
+        page = page_obj.cursor or ''
+    return {
+        'alias': settings.FEED_CACHE_ALIAS,
+        'timeout': settings.FEED_CACHE_TIMEOUT,
+        'key': f'{feed}:{get_feed_version(feed)}:{page}',
+    }
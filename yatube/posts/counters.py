@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from users.models import Profile
+from users.summaries import forget_authors
+
+from .models import Group, Post
+
+User = get_user_model()
+
+
+def change_author_count(author_id, delta):
+    """Атомарно меняет счётчик постов автора на delta."""
+
+    if author_id is None:
+        return
+    # Счётчик не уходит ниже нуля, даже если успел разойтись с данными.
+    updated = Profile.objects.filter(
+        user_id=author_id, posts_count__gte=-delta
+    ).update(posts_count=F('posts_count') + delta)
+    if not updated and delta > 0:
+        # Профиля ещё нет (пользователь создан до счётчиков): считаем заново.
+        # При уменьшении профиль не создаём: при удалении пользователя
+        # каскад удаляет профиль раньше его постов.
+        Profile.objects.get_or_create(
+            user_id=author_id,
+            defaults={'posts_count': Post.objects.filter(
+                author_id=author_id).count()},
+        )
+    # update() не вызывает сигналы профиля.
+    forget_authors(author_id)
+
+
+def author_posts_count(user):
+    """Счётчик постов автора с загруженным (select_related) профилем.
+
+       Профиля может не быть у пользователей из bulk_create или фикстур:
+       тогда он создаётся с пересчитанным количеством постов.
+    """
+
+    try:
+        return user.profile.posts_count
+    except Profile.DoesNotExist:
+        profile, _ = Profile.objects.get_or_create(
+            user=user,
+            defaults={'posts_count': Post.objects.filter(
+                author=user).count()},
+        )
+        user.profile = profile
+        return profile.posts_count
+
+
+def change_group_count(group_id, delta):
+    """Атомарно меняет счётчик постов группы на delta."""
+
+    if group_id is not None:
+        Group.objects.filter(
+            pk=group_id, posts_count__gte=-delta
+        ).update(posts_count=F('posts_count') + delta)
+
+
+def _count_subquery(field, outer_field):
+    posts = (Post.objects.filter(**{field: OuterRef(outer_field)})
+             .order_by().values(field).annotate(count=Count('pk'))
+             .values('count'))
+    return Coalesce(Subquery(posts), 0)
+
+
+def recount_posts():
+    """Пересчитывает все счётчики постов по таблице Post.
+
+       Возвращает количество исправленных профилей и групп.
+    """
+
+    users_without_profile = User.objects.filter(profile__isnull=True)
+    Profile.objects.bulk_create(
+        Profile(user=user) for user in users_without_profile.only('pk')
+    )
+    profiles = Profile.objects.annotate(
+        actual=_count_subquery('author', 'user_id')
+    ).exclude(posts_count=F('actual'))
+    profiles_fixed = 0
+    for profile in profiles.only('pk'):
+        profile.posts_count = profile.actual
+        profile.save(update_fields=['posts_count'])
+        profiles_fixed += 1
+    groups = Group.objects.annotate(
+        actual=_count_subquery('group', 'pk')
+    ).exclude(posts_count=F('actual'))
+    groups_fixed = 0
+    for group in groups.only('pk'):
+        group.posts_count = group.actual
+        group.save(update_fields=['posts_count'])
+        groups_fixed += 1
+    return profiles_fixed, groups_fixed
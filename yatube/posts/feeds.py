@@ -0,0 +1,172 @@
+import json
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import quote_etag
+
+from .cache import (INDEX_FEED, author_feed, get_feed_cache, get_feed_version,
+                    group_feed)
+from .groups import get_group_or_404
+from .models import Post
+
+User = get_user_model()
+
+FeedSource = namedtuple('FeedSource', 'name title link description posts')
+
+
+def get_feed_source(slug=None, username=None):
+    """Лента, которую отдаёт фид: главная, группы или автора."""
+
+    if slug is not None:
+        group = get_group_or_404(slug=slug)
+        return FeedSource(
+            group_feed(group.pk), f'Записи сообщества {group}',
+            reverse('posts:group_list', args=(group.slug,)),
+            group.description, Post.objects.feed().filter(group=group))
+    if username is not None:
+        author = get_object_or_404(User, username=username)
+        return FeedSource(
+            author_feed(author.pk), f'Все посты пользователя {author}',
+            reverse('posts:profile', args=(author.username,)),
+            f'Записи {author.get_full_name() or author}',
+            Post.objects.feed().filter(author=author))
+    return FeedSource(INDEX_FEED, 'Последние обновления на сайте',
+                      reverse('posts:index'), 'Новые записи Yatube',
+                      Post.objects.feed())
+
+
+class PostsRssFeed(Feed):
+    """RSS-лента постов главной страницы, группы или автора.
+
+       Лента (FeedSource) приходит от cached_feed уже найденной.
+    """
+
+    def get_object(self, request, source):
+        return source
+
+    def title(self, source):
+        return source.title
+
+    def link(self, source):
+        return source.link
+
+    def description(self, source):
+        return source.description
+
+    def items(self, source):
+        return source.posts[:settings.SYNDICATION_ITEMS]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return post.text_html
+
+    def item_link(self, post):
+        return reverse('posts:post_detail', args=(post.pk,))
+
+    def item_author_name(self, post):
+        return post.author.get_full_name() or post.author.username
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_updateddate(self, post):
+        return post.modified
+
+
+class PostsAtomFeed(PostsRssFeed):
+    """Та же лента в формате Atom."""
+
+    feed_type = Atom1Feed
+    subtitle = PostsRssFeed.description
+
+
+def _json_item(request, post):
+    return json.dumps({
+        'id': str(post.pk),
+        'url': request.build_absolute_uri(
+            reverse('posts:post_detail', args=(post.pk,))),
+        'content_html': post.text_html,
+        'date_published': post.pub_date.isoformat(),
+        'date_modified': post.modified.isoformat(),
+        'authors': [{'name': post.author.get_full_name()
+                     or post.author.username}],
+    }, ensure_ascii=False)
+
+
+def stream_json_feed(request, source, posts):
+    """По частям выдаёт JSON Feed 1.1, не собирая его в памяти."""
+
+    head = json.dumps({
+        'version': 'https://jsonfeed.org/version/1.1',
+        'title': source.title,
+        'home_page_url': request.build_absolute_uri(source.link),
+        'feed_url': request.build_absolute_uri(),
+        'description': source.description,
+    }, ensure_ascii=False)
+    yield head[:-1] + ', "items": ['
+    for number, post in enumerate(posts):
+        yield (', ' if number else '') + _json_item(request, post)
+    yield ']}'
+
+
+def render_json_feed(request, source):
+    """Лента в формате JSON Feed; с ?all=1 выгружает все посты потоком."""
+
+    if request.GET.get('all'):
+        posts = source.posts.iterator(chunk_size=500)
+    else:
+        posts = source.posts[:settings.SYNDICATION_ITEMS]
+    return StreamingHttpResponse(stream_json_feed(request, source, posts),
+                                 content_type='application/feed+json')
+
+
+def cached_feed(view, kind):
+    """Кеширует фид по версии ленты и отвечает 304 по ETag.
+
+       Версия ленты меняется сигналами при любом изменении её постов,
+       поэтому сбрасывать кеш фидов отдельно не нужно. view получает
+       найденную ленту в аргументе source.
+    """
+
+    def wrapper(request, **kwargs):
+        source = get_feed_source(**kwargs)
+        version = get_feed_version(source.name)
+        variant = 'all' if request.GET.get('all') else 'recent'
+        etag = quote_etag(f'{kind}-{variant}-{source.name}-{version}')
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            return response
+        if kind == 'json' and variant == 'all':
+            # Полную выгрузку не кешируем: она отдаётся потоком.
+            response = view(request, source=source)
+        else:
+            cache = get_feed_cache()
+            key = f'syndication:{kind}:{request.get_host()}:{etag}'
+            cached = cache.get(key)
+            if cached is None:
+                response = view(request, source=source)
+                if response.streaming:
+                    response = HttpResponse(
+                        b''.join(response.streaming_content),
+                        content_type=response['Content-Type'])
+                cached = (response.content, response['Content-Type'])
+                cache.set(key, cached, settings.SYNDICATION_CACHE_TIMEOUT)
+            response = HttpResponse(cached[0], content_type=cached[1])
+        response['ETag'] = etag
+        return response
+
+    return wrapper
+
+
+rss_feed = cached_feed(PostsRssFeed(), 'rss')
+atom_feed = cached_feed(PostsAtomFeed(), 'atom')
+json_feed = cached_feed(render_json_feed, 'json')
@@ -1,12 +1,68 @@
 from django import forms
+from django.conf import settings
+from django.forms.models import ModelChoiceIterator
+from django.urls import reverse
 
-from .models import Post
+from .groups import CachedGroupQuerySet, get_group, get_group_choices
+from .models import Group, Post
+
+
+class GroupChoiceIterator(ModelChoiceIterator):
+    """Варианты выбора группы из кеша групп, без запроса к БД."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        yield from get_group_choices()
+
+    def __len__(self):
+        return (len(get_group_choices())
+                + (1 if self.field.empty_label is not None else 0))
+
+    def __bool__(self):
+        return (self.field.empty_label is not None
+                or bool(get_group_choices()))
+
+
+class GroupSelect(forms.Select):
+    """Выбор группы.
+
+       Если групп больше GROUP_CHOICES_LIMIT, в списке выводится только
+       выбранная группа, а остальные ищутся через api:group_search.
+    """
+
+    def get_context(self, name, value, attrs):
+        if len(self.choices) <= settings.GROUP_CHOICES_LIMIT:
+            return super().get_context(name, value, attrs)
+        choices = self.choices
+        self.choices = self.selected_choices(value)
+        try:
+            context = super().get_context(name, value, attrs)
+        finally:
+            self.choices = choices
+        context['widget']['attrs']['data-autocomplete-url'] = reverse(
+            'api:group_search')
+        return context
+
+    def selected_choices(self, value):
+        first = next(iter(self.choices), None)
+        selected = [first] if first and first[0] == '' else []
+        for pk in self.format_value(value):
+            try:
+                group = get_group(pk=pk)
+            except (ValueError, TypeError, Group.DoesNotExist):
+                continue
+            selected.append((group.pk, group.title))
+        return selected
 
 
 class PostForm(forms.ModelForm):
     class Meta:
         model = Post
         fields = ('text', 'group',)
+        widgets = {
+            'group': GroupSelect,
+        }
         help_texts = {
             'text': 'Тут пишите текст поста',
             'group': 'Тут выбираете группу, к которой принадлежит пост',
@@ -15,3 +71,10 @@ class PostForm(forms.ModelForm):
             'text': 'Текст',
             'group': 'Группа',
         }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Список групп и выбранная группа берутся из кеша групп.
+        group = self.fields['group']
+        group.iterator = GroupChoiceIterator
+        group.queryset = CachedGroupQuerySet(Group)
@@ -0,0 +1,169 @@
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models, router
+from django.http import Http404
+
+from .cache import after_commit
+from .models import Group
+
+# Поля группы, которые хранятся в кеше. posts_count меняется с каждым
+# постом, поэтому у закешированной группы он отложен и читается из БД.
+GROUP_FIELDS = ('id', 'title', 'slug', 'description')
+
+_VERSION_KEY = 'group-cache-version'
+
+
+class LRUCache:
+    """Потокобезопасный LRU-кеш в памяти процесса."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_local = LRUCache(settings.GROUP_CACHE_SIZE)
+
+
+def get_group_cache():
+    return caches[settings.GROUP_CACHE_ALIAS]
+
+
+def _get_version(cache):
+    version = cache.get(_VERSION_KEY)
+    if version is None:
+        # Как и у лент, начальная версия от времени, чтобы после
+        # вытеснения ключа не вернуться к старым записям.
+        version = time.time_ns()
+        if not cache.add(_VERSION_KEY, version, None):
+            version = cache.get(_VERSION_KEY, version)
+    return version
+
+
+def _bump_version():
+    cache = get_group_cache()
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        cache.set(_VERSION_KEY, time.time_ns(), None)
+    _local.clear()
+
+
+def invalidate_groups():
+    """Сбрасывает закешированные группы во всех процессах.
+
+       Локальные кеши других процессов сверяют версию из общего кеша
+       при каждом обращении, поэтому устаревшие записи в них не читаются.
+    """
+
+    after_commit(_bump_version)
+
+
+def _make_group(values):
+    # Каждый вызов получает свой экземпляр: кешируются только значения.
+    return Group.from_db(router.db_for_read(Group), GROUP_FIELDS, values)
+
+
+def _load(field, value):
+    group = Group.objects.only(*GROUP_FIELDS).get(**{field: value})
+    return tuple(getattr(group, name) for name in GROUP_FIELDS)
+
+
+def _cached(name, load, aliases=None):
+    """Значение из кеша процесса, общего кеша или load().
+
+       aliases(value) — другие имена, под которыми сохраняется
+       загруженное значение.
+    """
+
+    cache = get_group_cache()
+    version = _get_version(cache)
+    value = _local.get((version, name))
+    if value is None:
+        value = cache.get(f'group:{version}:{name}')
+        if value is None:
+            value = load()
+            names = {name, *(aliases(value) if aliases else ())}
+            cache.set_many({f'group:{version}:{alias}': value
+                            for alias in names},
+                           settings.GROUP_CACHE_TIMEOUT)
+        _local.set((version, name), value)
+    return value
+
+
+def get_group(*, slug=None, pk=None):
+    """Группа по slug или pk из кеша процесса, общего кеша или БД.
+
+       Если группы нет, бросает Group.DoesNotExist.
+    """
+
+    field, value = ('slug', slug) if slug is not None else ('id', int(pk))
+    return _make_group(_cached(
+        f'{field}:{value}', lambda: _load(field, value),
+        lambda values: (f'id:{values[0]}', f'slug:{values[2]}')))
+
+
+def get_group_choices():
+    """Пары (pk, title) всех групп для выбора в форме."""
+
+    return _cached('choices', lambda: tuple(
+        Group.objects.order_by('pk').values_list('pk', 'title')))
+
+
+def search_groups(query, limit):
+    """Первые limit групп, в названии которых есть query."""
+
+    query = query.casefold()
+    matches = (choice for choice in get_group_choices()
+               if query in choice[1].casefold())
+    return list(islice(matches, limit))
+
+
+class CachedGroupQuerySet(models.QuerySet):
+    """QuerySet групп, у которого get() по pk или slug идёт через кеш.
+
+       Остальные запросы, в том числе get() после filter(), выполняются
+       как обычно.
+    """
+
+    def get(self, *args, **kwargs):
+        if not args and not self.query.has_filters() and len(kwargs) == 1:
+            (field, value), = kwargs.items()
+            if field in ('pk', 'id'):
+                return get_group(pk=value)
+            if field == 'slug':
+                return get_group(slug=value)
+        return super().get(*args, **kwargs)
+
+
+def get_group_or_404(*, slug=None, pk=None):
+    try:
+        return get_group(slug=slug, pk=pk)
+    except Group.DoesNotExist:
+        raise Http404('Группа не найдена.')
@@ -0,0 +1,28 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from posts.timeline import backfill_timeline, trim_timelines
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Заново собирает ленты подписок из подписок пользователей, '
+            'например после import_posts.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('usernames', nargs='*',
+                            help='Только ленты этих пользователей.')
+
+    def handle(self, *args, **options):
+        users = User.objects.only('pk').order_by('pk')
+        if options['usernames']:
+            users = users.filter(username__in=options['usernames'])
+        total = 0
+        for user in users.iterator():
+            backfill_timeline(user)
+            total += 1
+        trimmed = trim_timelines()
+        self.stdout.write(self.style.SUCCESS(
+            f'Собрано лент: {total}, удалено лишних записей: {trimmed}'
+        ))
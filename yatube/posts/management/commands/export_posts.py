@@ -0,0 +1,49 @@
+import csv
+import json
+
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+
+FIELDS = ('id', 'text', 'author', 'group', 'pub_date')
+
+
+class Command(BaseCommand):
+    help = ('Выгружает посты в JSON Lines или CSV потоком, не загружая '
+            'их в память целиком.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-',
+                            help='файл или - для stdout')
+        parser.add_argument('--format', choices=('jsonl', 'csv'))
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or (
+            'csv' if options['path'].endswith('.csv') else 'jsonl')
+        rows = Post.objects.order_by('pk').values_list(
+            'pk', 'text', 'author__username', 'group__slug', 'pub_date'
+        ).iterator(chunk_size=options['chunk_size'])
+
+        if options['path'] == '-':
+            count = self.write(self.stdout, rows, file_format)
+        else:
+            with open(options['path'], 'w', newline='',
+                      encoding='utf-8') as file:
+                count = self.write(file, rows, file_format)
+        self.stderr.write(f'Выгружено постов: {count}')
+
+    def write(self, file, rows, file_format):
+        count = 0
+        if file_format == 'csv':
+            writer = csv.writer(file)
+            writer.writerow(FIELDS)
+        for pk, text, author, group, pub_date in rows:
+            row = (pk, text, author, group or '', pub_date.isoformat())
+            if file_format == 'csv':
+                writer.writerow(row)
+            else:
+                file.write(json.dumps(dict(zip(FIELDS, row)),
+                                      ensure_ascii=False) + '\n')
+            count += 1
+        return count
@@ -0,0 +1,180 @@
+import csv
+import json
+import sys
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from posts.cache import (INDEX_FEED, author_feed, forget_feed_counts,
+                         group_feed, invalidate_feeds)
+from posts.counters import recount_posts
+from posts.models import Group, Post
+from posts.search import get_search_backend
+
+User = get_user_model()
+
+# Поля записи; все они строки и в JSON Lines, и в CSV.
+ROW_FIELDS = ('text', 'author', 'group', 'pub_date')
+
+
+@contextmanager
+def keep_timestamps():
+    """Отключает auto_now и auto_now_add у дат поста, чтобы сохранить
+       даты из файла при bulk_create.
+    """
+
+    fields = [Post._meta.get_field(name) for name in ('pub_date', 'modified')]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def read_rows(file, file_format):
+    """Построчно читает записи из JSON Lines или CSV.
+
+       Строки JSON отдаются неразобранными: их разбирает parse_row,
+       чтобы ошибка в одной строке пропускала только её.
+    """
+
+    if file_format == 'csv':
+        yield from csv.DictReader(file)
+        return
+    for line in file:
+        if line.strip():
+            yield line
+
+
+def parse_row(row):
+    """Запись CSV возвращает как есть, строку JSON Lines разбирает."""
+
+    if isinstance(row, str):
+        try:
+            row = json.loads(row)
+        except ValueError as error:
+            raise CommandError(f'неверный JSON: {error}')
+    if not isinstance(row, dict):
+        raise CommandError('запись должна быть объектом')
+    for field in ROW_FIELDS:
+        if row.get(field) is not None and not isinstance(row[field], str):
+            raise CommandError(f'поле {field} должно быть строкой')
+    return row
+
+
+class Command(BaseCommand):
+    help = ('Импортирует посты из JSON Lines или CSV с полями text, author '
+            '(username), group (slug) и pub_date.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='файл или - для stdin')
+        parser.add_argument('--format', choices=('jsonl', 'csv'))
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--create-missing', action='store_true',
+                            help='создавать неизвестных авторов и группы')
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or (
+            'csv' if options['path'].endswith('.csv') else 'jsonl')
+        self.create_missing = options['create_missing']
+        self.authors = {}
+        self.groups = {}
+        last_pk = Post.objects.aggregate(last=Max('pk'))['last'] or 0
+
+        if options['path'] == '-':
+            imported, skipped = self.import_rows(
+                read_rows(sys.stdin, file_format), options['batch_size'])
+        else:
+            with open(options['path'], newline='', encoding='utf-8') as file:
+                imported, skipped = self.import_rows(
+                    read_rows(file, file_format), options['batch_size'])
+
+        # bulk_create не вызывает сигналы: делаем их работу один раз.
+        recount_posts()
+        get_search_backend().index_queryset(
+            Post.objects.filter(pk__gt=last_pk), options['batch_size'])
+        feeds = [INDEX_FEED]
+        feeds += [author_feed(pk) for pk in self.authors.values()]
+        feeds += [group_feed(pk) for pk in self.groups.values() if pk]
+        forget_feed_counts(*feeds)
+        invalidate_feeds(*feeds)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Импортировано постов: {imported}, пропущено: {skipped}'
+        ))
+
+    def import_rows(self, rows, batch_size):
+        imported = skipped = 0
+        batch = []
+        for line, row in enumerate(rows, start=1):
+            try:
+                batch.append(self.build_post(row))
+            except CommandError as error:
+                skipped += 1
+                self.stderr.write(f'Строка {line}: {error}')
+                continue
+            if len(batch) == batch_size:
+                imported += self.save_batch(batch)
+                batch = []
+        return imported + self.save_batch(batch), skipped
+
+    def save_batch(self, batch):
+        with transaction.atomic(), keep_timestamps():
+            Post.objects.bulk_create(batch)
+        return len(batch)
+
+    def build_post(self, row):
+        row = parse_row(row)
+        text = row.get('text')
+        if not text:
+            raise CommandError('нет текста поста')
+        pub_date = timezone.now()
+        if row.get('pub_date'):
+            try:
+                pub_date = parse_datetime(row['pub_date'])
+            except ValueError:
+                # Формат верный, но такой даты нет: 2020-13-45.
+                pub_date = None
+            if pub_date is None:
+                raise CommandError(f'неверная дата {row["pub_date"]!r}')
+            if timezone.is_naive(pub_date):
+                pub_date = timezone.make_aware(pub_date)
+        post = Post(text=text, pub_date=pub_date, modified=pub_date,
+                    author_id=self.resolve_author(row.get('author')),
+                    group_id=self.resolve_group(row.get('group')))
+        # bulk_create не вызывает save(), где считается HTML текста.
+        post.render()
+        return post
+
+    def resolve_author(self, username):
+        if not username:
+            raise CommandError('не указан автор')
+        if username not in self.authors:
+            author = User.objects.filter(username=username).first()
+            if author is None and self.create_missing:
+                author = User.objects.create_user(username=username)
+            if author is None:
+                raise CommandError(f'нет пользователя {username!r}')
+            self.authors[username] = author.pk
+        return self.authors[username]
+
+    def resolve_group(self, slug):
+        if not slug:
+            return None
+        if slug not in self.groups:
+            group = Group.objects.filter(slug=slug).first()
+            if group is None and self.create_missing:
+                group = Group.objects.create(title=slug, slug=slug,
+                                             description='')
+            if group is None:
+                raise CommandError(f'нет группы {slug!r}')
+            self.groups[slug] = group.pk
+        return self.groups[slug]
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from posts.cache import INDEX_FEED, author_feed, group_feed, invalidate_feeds
+from posts.models import Post, render_posts
+
+
+class Command(BaseCommand):
+    help = ('Заново вычисляет HTML и заголовки постов, например после '
+            'изменения правил отрисовки.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--missing', action='store_true',
+                            help='Только посты без готового HTML.')
+
+    def handle(self, *args, **options):
+        posts = Post.objects.all()
+        if options['missing']:
+            posts = posts.filter(text_html='')
+        # Ленты собираем до отрисовки: после неё --missing их не найдёт.
+        posts = posts.order_by()
+        feeds = {INDEX_FEED}
+        feeds.update(author_feed(pk) for pk in posts.values_list(
+            'author_id', flat=True).distinct())
+        feeds.update(group_feed(pk) for pk in posts.filter(
+            group__isnull=False).values_list('group_id', flat=True).distinct())
+        total = render_posts(posts, options['batch_size'])
+        # bulk_update не вызывает сигналы, сбрасывающие кеш лент.
+        invalidate_feeds(*feeds)
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано постов: {total}'
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from posts.timeline import trim_timelines
+
+
+class Command(BaseCommand):
+    help = ('Удаляет из лент подписок записи сверх TIMELINE_MAX_ENTRIES; '
+            'запускается по расписанию.')
+
+    def handle(self, *args, **options):
+        deleted = trim_timelines()
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено лишних записей: {deleted}'
+        ))
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count
+
+
+def fill_counters(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    Profile = apps.get_model('users', 'Profile')
+    Group = apps.get_model('posts', 'Group')
+    Post = apps.get_model('posts', 'Post')
+
+    author_counts = dict(
+        Post.objects.order_by().values_list('author').annotate(Count('pk'))
+    )
+    Profile.objects.bulk_create(
+        Profile(user_id=user_id, posts_count=author_counts.get(user_id, 0))
+        for user_id in User.objects.filter(
+            profile__isnull=True).values_list('pk', flat=True)
+    )
+    group_counts = (
+        Post.objects.filter(group__isnull=False).order_by()
+        .values_list('group').annotate(Count('pk'))
+    )
+    for group_id, count in group_counts:
+        Group.objects.filter(pk=group_id).update(posts_count=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_group_posts_count'),
+        ('users', '0002_profile'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 2.2.16 on 2026-10-18 03:28
+
+from django.db import migrations, models
+from django.template.defaultfilters import linebreaksbr, truncatechars
+
+# Копия логики posts.models на момент миграции: миграция не должна
+# зависеть от текущего кода приложения.
+TITLE_LENGTH = 30
+BATCH_SIZE = 500
+
+
+def fill_text_html(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    batch = []
+    posts = Post.objects.only('pk', 'text').order_by('pk')
+    for post in posts.iterator(chunk_size=BATCH_SIZE):
+        post.text_html = str(linebreaksbr(post.text, autoescape=True))
+        post.title = truncatechars(post.text, TITLE_LENGTH)
+        batch.append(post)
+        if len(batch) == BATCH_SIZE:
+            Post.objects.bulk_update(batch, ['text_html', 'title'])
+            batch = []
+    if batch:
+        Post.objects.bulk_update(batch, ['text_html', 'title'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_timeline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='title',
+            field=models.CharField(blank=True, editable=False, max_length=30),
+        ),
+        migrations.RunPython(fill_text_html, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,51 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.template.defaultfilters import linebreaksbr, truncatechars
+from django.utils import timezone
 
 User = get_user_model()
 
+TITLE_LENGTH = 30
+
+
+def render_text(text):
+    """HTML текста поста: экранированный, с переносами строк."""
+
+    return str(linebreaksbr(text, autoescape=True))
+
+
+def make_title(text):
+    """Короткий заголовок поста из начала текста."""
+
+    return truncatechars(text, TITLE_LENGTH)
+
+
+def render_posts(queryset, batch_size=500):
+    """Пересчитывает HTML и заголовки постов пачками через bulk_update.
+
+       modified тоже обновляется: он входит в ETag страниц. Кеш лент
+       сбрасывает вызывающий код. Возвращает число обработанных постов.
+    """
+
+    total = 0
+    batch = []
+    fields = ['text_html', 'title', 'modified']
+    now = timezone.now()
+    posts = queryset.only('pk', 'text').order_by('pk')
+    for post in posts.iterator(chunk_size=batch_size):
+        post.text_html = render_text(post.text)
+        post.title = make_title(post.text)
+        post.modified = now
+        batch.append(post)
+        if len(batch) == batch_size:
+            queryset.model.objects.bulk_update(batch, fields)
+            total += len(batch)
+            batch = []
+    if batch:
+        queryset.model.objects.bulk_update(batch, fields)
+        total += len(batch)
+    return total
+
 
 class Group(models.Model):
     """Описывает поля модели Group и их типы."""
@@ -10,28 +53,138 @@ class Group(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(unique=True)
     description = models.TextField()
+    # Поддерживается сигналами posts.signals, чинится recount_posts.
+    posts_count = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    """Набор запросов для модели Post."""
+
+    # Поля, которые выводятся в ленте постов: всё остальное не загружаем.
+    FEED_FIELDS = (
+        'id', 'title', 'text_html', 'pub_date', 'modified',
+        'author_id', 'group_id', 'author__username', 'author__first_name',
+        'author__last_name', 'group__title', 'group__slug',
+    )
+
+    def feed(self):
+        """Посты для ленты: автор и группа загружаются одним запросом."""
+
+        return self.select_related('author', 'group').only(*self.FEED_FIELDS)
+
+
 class Post(models.Model):
     """Класс описывает поля модели Post и их типы."""
 
     text = models.TextField()
+    # Заполняются из text при сохранении, шаблоны выводят их как есть.
+    text_html = models.TextField(editable=False, blank=True)
+    title = models.CharField(max_length=TITLE_LENGTH, editable=False,
+                             blank=True)
     pub_date = models.DateTimeField(auto_now_add=True)
+    modified = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE,
                                related_name='posts')
     group = models.ForeignKey(Group, on_delete=models.SET_NULL,
                               blank=True, null=True,
                               related_name='posts')
 
+    objects = PostQuerySet.as_manager()
+
     class Meta:
         """Метакласс сортировки по дате"""
 
         ordering = ['-pub_date']
+        # Индексы под фильтр и сортировку каждой ленты постов.
+        indexes = [
+            models.Index(fields=['-pub_date', '-id'],
+                         name='post_feed_idx'),
+            models.Index(fields=['group', '-pub_date', '-id'],
+                         name='post_group_feed_idx'),
+            models.Index(fields=['author', '-pub_date', '-id'],
+                         name='post_author_feed_idx'),
+        ]
 
     def __str__(self):
         """Функция для вывода текста поста."""
 
         return self.text[:15]
+
+    def render(self):
+        """Заново вычисляет HTML и заголовок из текста.
+
+           bulk_create не вызывает save(), поэтому перед ним render()
+           нужно вызвать самому.
+        """
+
+        self.text_html = render_text(self.text)
+        self.title = make_title(self.text)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'text' in update_fields:
+            self.render()
+            if update_fields is not None:
+                # modified входит в ETag страниц: без него они отдавали бы
+                # 304 со старым текстом.
+                kwargs['update_fields'] = {*update_fields, 'text_html',
+                                           'title', 'modified'}
+        super().save(*args, **kwargs)
+
+
+class Follow(models.Model):
+    """Подписка пользователя на автора."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE,
+                             related_name='follower')
+    author = models.ForeignKey(User, on_delete=models.CASCADE,
+                               related_name='following')
+
+    class Meta:
+        unique_together = ('user', 'author')
+
+    def __str__(self):
+        return f'{self.user} → {self.author}'
+
+
+class GroupFollow(models.Model):
+    """Подписка пользователя на группу."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE,
+                             related_name='group_follows')
+    group = models.ForeignKey(Group, on_delete=models.CASCADE,
+                              related_name='followers')
+
+    class Meta:
+        unique_together = ('user', 'group')
+
+    def __str__(self):
+        return f'{self.user} → {self.group}'
+
+
+class TimelineEntry(models.Model):
+    """Пост в ленте подписок пользователя.
+
+       Записи создаются при публикации поста (fan-out on write), поэтому
+       лента читается по индексу без соединения с подписками.
+       pub_date копируется из поста для сортировки.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE,
+                             related_name='timeline')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE,
+                             related_name='timeline_entries')
+    pub_date = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('user', 'post')
+        indexes = [
+            models.Index(fields=['user', '-pub_date', '-id'],
+                         name='timeline_user_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.user}: {self.post}'
@@ -0,0 +1,165 @@
+import base64
+import binascii
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+
+def count_cache_key(count_key):
+    return f'feed-count:{count_key}'
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, который хранит общее количество объектов в кеше.
+
+       count_key — имя ленты из posts.cache; при сохранении и удалении
+       постов счётчик в кеше увеличивается или уменьшается сигналами.
+    """
+
+    def __init__(self, object_list, per_page, count_key, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self):
+        cache = caches[settings.FEED_CACHE_ALIAS]
+        key = count_cache_key(self.count_key)
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, settings.PAGINATOR_COUNT_TIMEOUT)
+        return count
+
+
+class KnownCountPaginator(Paginator):
+    """Paginator с заранее известным количеством объектов.
+
+       Подходит, когда счётчик уже загружен вместе с владельцем ленты
+       (например, Profile.posts_count) и отдельный COUNT не нужен.
+    """
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count = count
+
+
+class InvalidCursor(Exception):
+    """Курсор не удалось разобрать."""
+
+
+class CursorPage(Sequence):
+    """Страница курсорной пагинации.
+
+       В отличие от django.core.paginator.Page не знает ни номера страницы,
+       ни общего количества объектов — только соседние курсоры.
+    """
+
+    is_cursor_page = True
+
+    def __init__(self, object_list, paginator, cursor=None,
+                 next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Пагинация по ключу (pub_date, id) без COUNT(*) и OFFSET.
+
+       Курсор — непрозрачная строка, которая хранит направление и ключ
+       крайнего поста текущей страницы.
+    """
+
+    NEXT = 'n'
+    PREVIOUS = 'p'
+
+    def __init__(self, queryset, per_page, key_field='pub_date'):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.key_field = key_field
+
+    def encode_cursor(self, direction, obj):
+        value = getattr(obj, self.key_field).isoformat()
+        raw = f'{direction}|{value}|{obj.pk}'.encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            raw = base64.urlsafe_b64decode(cursor + padding).decode()
+            direction, value, pk = raw.split('|')
+            key = parse_datetime(value)
+            pk = int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise InvalidCursor(cursor)
+        if direction not in (self.NEXT, self.PREVIOUS) or key is None:
+            raise InvalidCursor(cursor)
+        return direction, key, pk
+
+    def _ordered(self, descending=True):
+        prefix = '-' if descending else ''
+        return self.queryset.order_by(f'{prefix}{self.key_field}',
+                                      f'{prefix}pk')
+
+    def page(self, cursor=None):
+        """Возвращает страницу для курсора; без курсора — первую."""
+
+        if not cursor:
+            rows = list(self._ordered()[:self.per_page + 1])
+            has_next, has_previous = len(rows) > self.per_page, False
+            rows = rows[:self.per_page]
+        else:
+            direction, key, pk = self.decode_cursor(cursor)
+            if direction == self.NEXT:
+                after = (Q(**{f'{self.key_field}__lt': key})
+                         | Q(**{self.key_field: key, 'pk__lt': pk}))
+                rows = list(self._ordered().filter(after)[:self.per_page + 1])
+                has_next, has_previous = len(rows) > self.per_page, True
+                rows = rows[:self.per_page]
+            else:
+                before = (Q(**{f'{self.key_field}__gt': key})
+                          | Q(**{self.key_field: key, 'pk__gt': pk}))
+                rows = list(self._ordered(descending=False).filter(
+                    before)[:self.per_page + 1])
+                has_next, has_previous = True, len(rows) > self.per_page
+                rows = rows[:self.per_page][::-1]
+        return CursorPage(
+            rows, self, cursor=cursor,
+            next_cursor=(self.encode_cursor(self.NEXT, rows[-1])
+                         if has_next and rows else None),
+            previous_cursor=(self.encode_cursor(self.PREVIOUS, rows[0])
+                             if has_previous and rows else None),
+        )
+
+    def get_page(self, cursor=None):
+        """Как page(), но при неверном курсоре отдаёт первую страницу."""
+
+        try:
+            return self.page(cursor)
+        except InvalidCursor:
+            return self.page()
@@ -0,0 +1,181 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+
+from .models import Post
+
+FTS_TABLE = 'posts_post_fts'
+
+
+class SearchResults:
+    """Ленивый результат поиска для Paginator.
+
+       Считает совпадения и загружает посты только для нужного среза.
+    """
+
+    def __init__(self, backend, query):
+        self.backend = backend
+        self.query = query
+
+    @cached_property
+    def _count(self):
+        return self.backend.count(self.query)
+
+    def count(self):
+        return self._count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        ids = self.backend.ranked_ids(self.query, key.start or 0, key.stop)
+        posts = Post.objects.feed().in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
+
+
+class BaseSearchBackend:
+    """Интерфейс поискового бэкенда для постов."""
+
+    def index(self, posts):
+        """Добавляет или обновляет посты в индексе."""
+
+        raise NotImplementedError
+
+    def remove(self, post_ids):
+        """Удаляет посты из индекса."""
+
+        raise NotImplementedError
+
+    def rebuild(self, batch_size=1000):
+        """Заново строит индекс по всем постам, возвращает их число."""
+
+        raise NotImplementedError
+
+    def index_queryset(self, queryset, batch_size=1000):
+        """Индексирует посты из queryset пачками, возвращает их число."""
+
+        total = 0
+        batch = []
+        posts = queryset.only('pk', 'text').order_by()
+        for post in posts.iterator(chunk_size=batch_size):
+            batch.append(post)
+            if len(batch) == batch_size:
+                self.index(batch)
+                total += len(batch)
+                batch = []
+        self.index(batch)
+        return total + len(batch)
+
+    def count(self, query):
+        raise NotImplementedError
+
+    def ranked_ids(self, query, start, stop):
+        """id постов, подходящих под запрос, от самых релевантных."""
+
+        raise NotImplementedError
+
+    def search(self, query):
+        return SearchResults(self, query)
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """Поиск через виртуальную таблицу SQLite FTS5 (см. миграцию 0006)."""
+
+    @staticmethod
+    def match_expression(query):
+        # Каждое слово ищется как префикс; кавычки экранируют
+        # синтаксис FTS5 во вводе пользователя.
+        words = re.findall(r'\w+', query)
+        return ' '.join(f'"{word}"*' for word in words)
+
+    def index(self, posts):
+        posts = [(post.pk, post.text) for post in posts]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                [(pk,) for pk, _ in posts])
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, text) VALUES (%s, %s)',
+                posts)
+
+    def remove(self, post_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                [(pk,) for pk in post_ids])
+
+    def rebuild(self, batch_size=1000):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        return self.index_queryset(Post.objects.all(), batch_size)
+
+    def count(self, query):
+        expression = self.match_expression(query)
+        if not expression:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT COUNT(*) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s', [expression])
+            return cursor.fetchone()[0]
+
+    def ranked_ids(self, query, start, stop):
+        expression = self.match_expression(query)
+        if not expression:
+            return []
+        limit = -1 if stop is None else stop - start
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+                f'ORDER BY rank LIMIT %s OFFSET %s',
+                [expression, limit, start])
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Поиск по tsvector в PostgreSQL.
+
+       Вектор строится на лету выражением SearchVector('text'), поэтому
+       отдельную таблицу поддерживать не нужно; для больших объёмов к нему
+       добавляется GIN-индекс по тому же выражению.
+    """
+
+    config = 'russian'
+
+    def _matches(self, query):
+        from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                                    SearchVector)
+
+        vector = SearchVector('text', config=self.config)
+        search_query = SearchQuery(query, config=self.config)
+        return Post.objects.annotate(
+            rank=SearchRank(vector, search_query)
+        ).filter(rank__gt=0)
+
+    def index(self, posts):
+        pass
+
+    def index_queryset(self, queryset, batch_size=1000):
+        return queryset.count()
+
+    def remove(self, post_ids):
+        pass
+
+    def rebuild(self, batch_size=1000):
+        return Post.objects.count()
+
+    def count(self, query):
+        return self._matches(query).count()
+
+    def ranked_ids(self, query, start, stop):
+        ids = self._matches(query).order_by('-rank', '-pub_date')
+        return list(ids.values_list('pk', flat=True)[start:stop])
+
+
+def get_search_backend():
+    return import_string(settings.POSTS_SEARCH_BACKEND)()
@@ -0,0 +1,143 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from .cache import (INDEX_FEED, author_feed, change_feed_counts, group_feed,
+                    invalidate_feeds)
+from .counters import change_author_count, change_group_count
+from .groups import invalidate_groups
+from .models import Group, Post
+from .tasks import fan_out_post, index_posts, remove_posts
+
+User = get_user_model()
+
+# Поля пользователя, которые выводятся в лентах.
+AUTHOR_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+def _snapshot(post):
+    # Берём значения из __dict__, чтобы не загружать отложенные поля.
+    return post.__dict__.get('author_id'), post.__dict__.get('group_id')
+
+
+def post_feeds(author_id, group_id):
+    """Ленты, в которых выводится пост с такими автором и группой."""
+
+    if author_id is None:
+        return set()
+    feeds = {INDEX_FEED, author_feed(author_id)}
+    if group_id is not None:
+        feeds.add(group_feed(group_id))
+    return feeds
+
+
+def group_feeds(group_id):
+    """Ленты, в которых выводятся данные группы."""
+
+    author_ids = (Post.objects.filter(group_id=group_id).order_by()
+                  .values_list('author_id', flat=True).distinct())
+    return {INDEX_FEED, group_feed(group_id),
+            *(author_feed(author_id) for author_id in author_ids)}
+
+
+def update_counters(old_author_id, old_group_id, author_id, group_id):
+    """Переносит пост в счётчиках со старых автора и группы на новые.
+
+       None вместо старых значений — пост создан, вместо новых — удалён.
+    """
+
+    if author_id != old_author_id:
+        change_author_count(old_author_id, -1)
+        change_author_count(author_id, 1)
+    if group_id != old_group_id:
+        change_group_count(old_group_id, -1)
+        change_group_count(group_id, 1)
+    old_feeds = post_feeds(old_author_id, old_group_id)
+    new_feeds = post_feeds(author_id, group_id)
+    change_feed_counts(old_feeds - new_feeds, -1)
+    change_feed_counts(new_feeds - old_feeds, 1)
+
+
+@receiver(post_init, sender=Post)
+def remember_post_state(sender, instance, **kwargs):
+    """Запоминает автора и группу поста до изменения."""
+
+    instance._saved_state = _snapshot(instance)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, raw=False, **kwargs):
+    """Обновляет счётчики постов и кеш затронутых лент, ставит в очередь
+       обновление поискового индекса и лент подписчиков.
+    """
+
+    author_id, group_id = _snapshot(instance)
+    if created:
+        old_author_id = old_group_id = None
+    else:
+        old_author_id, old_group_id = instance._saved_state
+    if not raw:
+        update_counters(old_author_id, old_group_id, author_id, group_id)
+    invalidate_feeds(*post_feeds(author_id, group_id),
+                     *post_feeds(old_author_id, old_group_id))
+    instance._saved_state = (author_id, group_id)
+    if not raw:
+        # Индекс и ленты подписок обновляются в фоне, счётчики и кеш —
+        # сразу, чтобы автор увидел свой пост.
+        index_posts.delay([instance.pk])
+        # Пост, перенесённый в группу, получают и её подписчики.
+        if created or (group_id is not None and group_id != old_group_id):
+            fan_out_post.delay(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    """Уменьшает счётчики постов, сбрасывает кеш затронутых лент
+       и ставит в очередь удаление поста из поискового индекса.
+    """
+
+    author_id, group_id = instance._saved_state
+    update_counters(author_id, group_id, None, None)
+    invalidate_feeds(*post_feeds(author_id, group_id))
+    remove_posts.delay([instance.pk])
+
+
+@receiver(post_save, sender=Group)
+def group_saved(sender, instance, **kwargs):
+    """Сбрасывает кеш групп и лент, в которых выводятся данные группы."""
+
+    invalidate_groups()
+    invalidate_feeds(*group_feeds(instance.pk))
+
+
+@receiver(pre_delete, sender=Group)
+def remember_group_feeds(sender, instance, **kwargs):
+    """Запоминает ленты группы: после удаления у постов её уже нет."""
+
+    instance._feeds = group_feeds(instance.pk)
+
+
+@receiver(post_delete, sender=Group)
+def group_deleted(sender, instance, **kwargs):
+    """Сбрасывает кеш групп и лент, в которых выводились данные группы.
+
+       SET_NULL обновляет посты без их сигналов, поэтому ленты
+       сбрасываются здесь.
+    """
+
+    invalidate_groups()
+    invalidate_feeds(*instance._feeds)
+
+
+@receiver(post_save, sender=User)
+def author_saved(sender, instance, created, update_fields=None, **kwargs):
+    """Сбрасывает кеш лент с постами автора: в них выводится его имя."""
+
+    if created or (update_fields is not None
+                   and not AUTHOR_FIELDS & set(update_fields)):
+        return
+    group_ids = (Post.objects.filter(author=instance, group__isnull=False)
+                 .order_by().values_list('group_id', flat=True).distinct())
+    invalidate_feeds(INDEX_FEED, author_feed(instance.pk),
+                     *(group_feed(group_id) for group_id in group_ids))
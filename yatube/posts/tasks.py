@@ -0,0 +1,30 @@
+from tasks.queue import task
+
+from .models import Post
+from .search import get_search_backend
+from .timeline import fan_out
+
+
+@task()
+def index_posts(post_ids):
+    """Обновляет посты в поисковом индексе."""
+
+    get_search_backend().index(
+        Post.objects.filter(pk__in=post_ids).only('pk', 'text'))
+
+
+@task()
+def remove_posts(post_ids):
+    """Убирает удалённые посты из поискового индекса."""
+
+    get_search_backend().remove(post_ids)
+
+
+@task()
+def fan_out_post(post_id):
+    """Раскладывает пост по лентам подписчиков."""
+
+    post = (Post.objects.filter(pk=post_id)
+            .only('pk', 'pub_date', 'author_id', 'group_id').first())
+    if post is not None:
+        fan_out(post)
@@ -0,0 +1,109 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+
+from posts.cache import INDEX_FEED, get_feed_version
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class FeedCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(author=cls.user, text='Старый текст',
+                                       group=cls.group)
+        cls.other_post = Post.objects.create(author=cls.user,
+                                             text='Другой текст',
+                                             group=cls.other_group)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_feed_page_is_cached(self):
+        """Страница ленты отдаётся из кеша, пока её не сбросили."""
+
+        url = reverse('posts:index')
+        self.guest_client.get(url)
+        # update() не вызывает сигналы, поэтому кеш не сбрасывается.
+        Post.objects.filter(pk=self.post.pk).update(text='Новый текст')
+
+        response = self.guest_client.get(url)
+        self.assertContains(response, 'Старый текст')
+
+    def test_post_create_invalidates_affected_feeds(self):
+        """Новый пост сбрасывает кеш только затронутых лент."""
+
+        urls = (reverse('posts:index'),
+                reverse('posts:group_list', args=(self.group.slug,)),
+                reverse('posts:group_list', args=(self.other_group.slug,)),
+                reverse('posts:profile', args=(self.user.username,)))
+        for url in urls:
+            self.guest_client.get(url)
+        Post.objects.filter(pk=self.other_post.pk).update(text='Обновлено')
+
+        self.authorized_client.post(reverse('posts:post_create'),
+                                    {'text': 'Свежий пост',
+                                     'group': self.group.pk})
+
+        for url in (urls[0], urls[1], urls[3]):
+            with self.subTest(url=url):
+                self.assertContains(self.guest_client.get(url),
+                                    'Свежий пост')
+        self.assertContains(self.guest_client.get(urls[2]), 'Другой текст')
+
+    def test_post_edit_invalidates_old_group_feed(self):
+        """При переносе поста в другую группу сбрасывается кеш обеих."""
+
+        url = reverse('posts:group_list', args=(self.group.slug,))
+        self.guest_client.get(url)
+
+        self.authorized_client.post(
+            reverse('posts:post_edit', args=(self.post.pk,)),
+            {'text': self.post.text, 'group': self.other_group.pk})
+
+        self.assertNotContains(self.guest_client.get(url), 'Старый текст')
+
+    def test_group_delete_invalidates_feeds(self):
+        """Удаление группы сбрасывает ленты с её постами."""
+
+        group_url = reverse('posts:group_list', args=(self.group.slug,))
+        urls = (reverse('posts:index'),
+                reverse('posts:profile', args=(self.user.username,)))
+        for url in urls:
+            self.assertContains(self.guest_client.get(url), group_url)
+
+        Group.objects.get(pk=self.group.pk).delete()
+
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertNotContains(self.guest_client.get(url),
+                                       group_url)
+
+
+class FeedCacheCommitTest(TransactionTestCase):
+    def test_version_changes_after_commit(self):
+        """Версия ленты меняется ещё раз после коммита транзакции."""
+
+        author = User.objects.create_user(username='auth')
+        with transaction.atomic():
+            Post.objects.create(author=author, text='Пост')
+            version = get_feed_version(INDEX_FEED)
+        self.assertNotEqual(get_feed_version(INDEX_FEED), version)
@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from posts.models import Group, Post
+from posts.search import get_search_backend
+
+User = get_user_model()
+
+
+class ImportExportPostsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_file(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        return path
+
+    def test_import_jsonl(self):
+        """Импорт сохраняет даты, обновляет счётчики и поиск."""
+
+        rows = [
+            {'text': 'Импортный кот', 'author': 'auth', 'group': 'test-slug',
+             'pub_date': '2020-01-02T03:04:05+00:00'},
+            {'text': 'Без группы', 'author': 'auth'},
+            {'text': 'Чужой', 'author': 'nobody'},
+        ]
+        path = self.write_file(
+            'posts.jsonl', '\n'.join(json.dumps(row) for row in rows))
+
+        call_command('import_posts', path, batch_size=1,
+                     stdout=StringIO(), stderr=StringIO())
+
+        post = Post.objects.get(text='Импортный кот')
+        self.assertEqual(post.pub_date.year, 2020)
+        self.assertEqual(post.group, self.group)
+        self.assertEqual(Post.objects.count(), 2)
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.posts_count, 2)
+        self.assertEqual(list(get_search_backend().search('кот')[:10]),
+                         [post])
+
+    def test_import_skips_malformed_lines(self):
+        """Строка с неверным JSON пропускается, остальные импортируются."""
+
+        path = self.write_file('posts.jsonl', '\n'.join((
+            json.dumps({'text': 'Первый', 'author': 'auth'}),
+            '{"text": "Оборванный',
+            '[1, 2]',
+            json.dumps({'text': 'Последний', 'author': 'auth'}),
+        )))
+        stdout = StringIO()
+
+        call_command('import_posts', path, stdout=stdout, stderr=StringIO())
+
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertIn('пропущено: 2', stdout.getvalue())
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.posts_count, 2)
+
+    def test_import_skips_invalid_values(self):
+        """Невозможная дата и не строковые поля пропускают только строку."""
+
+        rows = [
+            {'text': 'Первый', 'author': 'auth'},
+            {'text': 'Кривая дата', 'author': 'auth',
+             'pub_date': '2020-13-45T00:00:00'},
+            {'text': 'Список', 'author': ['auth']},
+            {'text': 'Последний', 'author': 'auth'},
+        ]
+        path = self.write_file(
+            'posts.jsonl', '\n'.join(json.dumps(row) for row in rows))
+        stdout = StringIO()
+
+        call_command('import_posts', path, stdout=stdout, stderr=StringIO())
+
+        self.assertEqual(
+            set(Post.objects.values_list('text', flat=True)),
+            {'Первый', 'Последний'})
+        self.assertIn('пропущено: 2', stdout.getvalue())
+
+    def test_import_csv_creates_missing(self):
+        """С --create-missing создаются новые авторы и группы."""
+
+        path = self.write_file(
+            'posts.csv', 'text,author,group\nПривет,newbie,new-group\n')
+
+        call_command('import_posts', path, create_missing=True,
+                     stdout=StringIO(), stderr=StringIO())
+
+        post = Post.objects.get()
+        self.assertEqual(post.author.username, 'newbie')
+        self.assertEqual(post.group.slug, 'new-group')
+
+    def test_export_import_roundtrip(self):
+        """Выгруженные посты загружаются обратно без потерь."""
+
+        Post.objects.create(author=self.user, text='Первый',
+                            group=self.group)
+        Post.objects.create(author=self.user, text='Второй\nс переносом')
+        path = os.path.join(self.directory.name, 'export.csv')
+        call_command('export_posts', path, stderr=StringIO())
+        exported = list(Post.objects.values_list('text', 'group',
+                                                 'pub_date'))
+        Post.objects.all().delete()
+
+        call_command('import_posts', path, stdout=StringIO(),
+                     stderr=StringIO())
+
+        self.assertCountEqual(
+            Post.objects.values_list('text', 'group', 'pub_date'), exported)
+
+    def test_export_to_stdout(self):
+        Post.objects.create(author=self.user, text='Тест')
+        out = StringIO()
+        call_command('export_posts', stdout=out, stderr=StringIO())
+        row = json.loads(out.getvalue())
+        self.assertEqual((row['text'], row['author'], row['group']),
+                         ('Тест', 'auth', ''))
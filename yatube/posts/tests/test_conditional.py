@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(author=cls.user, text='Тест',
+                                       group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.user.username,)),
+            reverse('posts:post_detail', args=(self.post.pk,)),
+        )
+
+    def test_matching_etag_returns_not_modified(self):
+        """С актуальным ETag страница не отрисовывается заново."""
+
+        for url in self.urls:
+            with self.subTest(url=url):
+                etag = self.guest_client.get(url)['ETag']
+                response = self.guest_client.get(url,
+                                                 HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code,
+                                 HTTPStatus.NOT_MODIFIED)
+                self.assertEqual(response.content, b'')
+
+    def test_post_change_updates_validators(self):
+        """После изменения поста страницы отдаются целиком."""
+
+        responses = [self.guest_client.get(url) for url in self.urls]
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Новый текст'
+        post.save()
+
+        for url, old in zip(self.urls, responses):
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=old['ETag'])
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_no_last_modified(self):
+        """Страницы проверяются только по ETag."""
+
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertFalse(response.has_header('Last-Modified'))
+                response = self.guest_client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=http_date())
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    @override_settings(PAGINATOR=2)
+    def test_deleted_post_updates_page(self):
+        """Удаление поста сдвигает на страницу более старый пост."""
+
+        Post.objects.create(author=self.user, text='Второй')
+        third = Post.objects.create(author=self.user, text='Третий')
+        url = reverse('posts:profile', args=(self.user.username,))
+        etag = self.guest_client.get(url)['ETag']
+        third.delete()
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_etag_changes_after_login(self):
+        """После повторного входа CSRF-токен новый, и страница тоже."""
+
+        client = Client()
+        client.force_login(self.user)
+        url = reverse('posts:profile', args=(self.user.username,))
+        client.get(url)
+        etag = client.get(url)['ETag']
+        client.logout()
+        client.force_login(self.user)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_etag_depends_on_user(self):
+        """У анонима и вошедшего пользователя разные ETag."""
+
+        url = reverse('posts:index')
+        authorized_client = Client()
+        authorized_client.force_login(self.user)
+        self.assertNotEqual(self.guest_client.get(url)['ETag'],
+                            authorized_client.get(url)['ETag'])
@@ -0,0 +1,80 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from posts.models import Group, Post
+from users.models import Profile
+
+User = get_user_model()
+
+
+class PostsCountersTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other-slug',
+            description='Тестовое описание',
+        )
+
+    def assertCounts(self, user_count, other_count, group_count,
+                     other_group_count):
+        self.assertEqual(
+            (Profile.objects.get(user=self.user).posts_count,
+             Profile.objects.get(user=self.other).posts_count,
+             Group.objects.get(pk=self.group.pk).posts_count,
+             Group.objects.get(pk=self.other_group.pk).posts_count),
+            (user_count, other_count, group_count, other_group_count),
+        )
+
+    def test_counters_follow_post_changes(self):
+        """Счётчики меняются при создании, переносе и удалении поста."""
+
+        post = Post.objects.create(author=self.user, text='Тест',
+                                   group=self.group)
+        self.assertCounts(1, 0, 1, 0)
+
+        post.author = self.other
+        post.group = self.other_group
+        post.save()
+        self.assertCounts(0, 1, 0, 1)
+
+        post = Post.objects.get(pk=post.pk)
+        post.text = 'Новый текст'
+        post.save()
+        self.assertCounts(0, 1, 0, 1)
+
+        post.delete()
+        self.assertCounts(0, 0, 0, 0)
+
+    def test_recount_posts_repairs_drift(self):
+        """recount_posts исправляет разошедшиеся счётчики."""
+
+        Post.objects.create(author=self.user, text='Тест', group=self.group)
+        Profile.objects.filter(user=self.user).update(posts_count=10)
+        Group.objects.filter(pk=self.group.pk).update(posts_count=0)
+        Profile.objects.filter(user=self.other).delete()
+
+        call_command('recount_posts', stdout=StringIO())
+
+        self.assertCounts(1, 0, 1, 0)
+
+    def test_delete_author_with_posts(self):
+        """При удалении автора профиль не создаётся заново каскадом."""
+
+        author = User.objects.create_user(username='leaving')
+        for number in range(3):
+            Post.objects.create(author=author, text=f'Пост {number}')
+        author.delete()
+        self.assertFalse(Profile.objects.filter(user_id=author.pk).exists())
+        self.assertFalse(User.objects.filter(username='leaving').exists())
@@ -0,0 +1,117 @@
+import json
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class FeedsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(author=cls.user, text='Пост в группе',
+                                       group=cls.group)
+        cls.other_post = Post.objects.create(author=cls.other,
+                                             text='Пост без группы')
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def feed_urls(self, name):
+        return {
+            'index': reverse(f'posts:index_{name}'),
+            'group': reverse(f'posts:group_{name}', args=(self.group.slug,)),
+            'profile': reverse(f'posts:profile_{name}',
+                               args=(self.user.username,)),
+        }
+
+    def test_feeds_contain_their_posts(self):
+        """В фидах только посты своей ленты."""
+
+        expected = {
+            'index': (self.post.text, self.other_post.text),
+            'group': (self.post.text,),
+            'profile': (self.post.text,),
+        }
+        for name in ('rss', 'atom', 'json'):
+            for feed, url in self.feed_urls(name).items():
+                with self.subTest(url=url):
+                    response = self.guest_client.get(url)
+                    self.assertEqual(response.status_code, HTTPStatus.OK)
+                    content = b''.join(response.streaming_content
+                                       if response.streaming
+                                       else [response.content])
+                    content = content.decode()
+                    for text in expected[feed]:
+                        self.assertIn(text, content)
+                    if feed != 'index':
+                        self.assertNotIn(self.other_post.text, content)
+
+    def test_json_feed_format(self):
+        """JSON-фид соответствует JSON Feed 1.1, полная выгрузка — поток."""
+
+        url = reverse('posts:index_json')
+        data = json.loads(self.guest_client.get(url).content)
+        self.assertEqual(data['version'], 'https://jsonfeed.org/version/1.1')
+        self.assertEqual([item['id'] for item in data['items']],
+                         [str(self.other_post.pk), str(self.post.pk)])
+
+        response = self.guest_client.get(url, {'all': 1})
+        self.assertTrue(response.streaming)
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(len(data['items']), 2)
+
+    def test_unknown_group_or_author(self):
+        """Фид несуществующей группы или автора отдаёт 404."""
+
+        for url in (reverse('posts:group_rss', args=('missing',)),
+                    reverse('posts:profile_json', args=('missing',))):
+            with self.subTest(url=url):
+                self.assertEqual(self.guest_client.get(url).status_code,
+                                 HTTPStatus.NOT_FOUND)
+
+    def test_feeds_are_cached_and_conditional(self):
+        """Повторный фид берётся из кеша, с актуальным ETag — 304."""
+
+        url = reverse('posts:group_rss', args=(self.group.slug,))
+        etag = self.guest_client.get(url)['ETag']
+        # Группа тоже берётся из кеша.
+        with self.assertNumQueries(0):
+            self.guest_client.get(url)
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_feed_source_is_resolved_once(self):
+        """При промахе кеша автор ищется одним запросом, посты — вторым."""
+
+        for name in ('rss', 'json'):
+            url = reverse(f'posts:profile_{name}', args=(self.user.username,))
+            with self.subTest(url=url), self.assertNumQueries(2):
+                self.guest_client.get(url)
+
+    def test_post_change_updates_feed(self):
+        """Изменение поста сразу видно в фиде."""
+
+        url = reverse('posts:profile_atom', args=(self.user.username,))
+        etag = self.guest_client.get(url)['ETag']
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Новый текст'
+        post.save()
+
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn('Новый текст', response.content.decode())
@@ -0,0 +1,180 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import (Client, TestCase, TransactionTestCase,
+                         override_settings)
+from django.urls import reverse
+
+from posts.forms import PostForm
+from posts.groups import (_VERSION_KEY, CachedGroupQuerySet, LRUCache,
+                          get_group, get_group_cache)
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class LRUCacheTest(TestCase):
+    def test_least_recently_used_is_evicted(self):
+        lru = LRUCache(2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertEqual(lru.get('a'), 1)
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(lru.get('c'), 3)
+        self.assertEqual(len(lru), 2)
+
+
+class GroupCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_group_is_read_once(self):
+        """После первого чтения группа отдаётся по slug и pk без БД."""
+
+        with self.assertNumQueries(1):
+            group = get_group(slug=self.group.slug)
+        with self.assertNumQueries(0):
+            by_slug = get_group(slug=self.group.slug)
+            by_pk = get_group(pk=self.group.pk)
+        for cached in (group, by_slug, by_pk):
+            self.assertEqual(cached, self.group)
+            self.assertEqual(cached.title, self.group.title)
+            self.assertEqual(cached.description, self.group.description)
+        self.assertIsNot(by_slug, by_pk)
+
+    def test_missing_group(self):
+        with self.assertRaises(Group.DoesNotExist):
+            get_group(slug='missing')
+
+    def test_posts_count_is_read_from_database(self):
+        get_group(pk=self.group.pk)
+        Post.objects.create(author=self.user, text='Пост', group=self.group)
+        self.assertEqual(get_group(pk=self.group.pk).posts_count, 1)
+
+    def test_save_and_delete_invalidate_cache(self):
+        get_group(slug=self.group.slug)
+        group = Group.objects.get(pk=self.group.pk)
+        group.title = 'Новое название'
+        group.save()
+        self.assertEqual(get_group(slug=self.group.slug).title,
+                         'Новое название')
+        group.delete()
+        with self.assertRaises(Group.DoesNotExist):
+            get_group(pk=self.group.pk)
+
+    def test_admin_change_invalidates_cache(self):
+        admin = User.objects.create_superuser('admin', 'admin@example.com',
+                                              'password')
+        client = Client()
+        client.force_login(admin)
+        get_group(slug=self.group.slug)
+        client.post(
+            reverse('admin:posts_group_change', args=(self.group.pk,)),
+            {'title': 'Из админки', 'slug': self.group.slug,
+             'description': self.group.description, 'posts_count': 0})
+        self.assertEqual(get_group(slug=self.group.slug).title, 'Из админки')
+
+    def test_group_page_uses_cache(self):
+        url = reverse('posts:group_list', args=(self.group.slug,))
+        response = Client().get(url)
+        self.assertEqual(response.context['group'], self.group)
+        self.assertEqual(Client().get(
+            reverse('posts:group_list', args=('missing',))).status_code, 404)
+
+    def test_cached_queryset_get(self):
+        """Из кеша берётся только get() без других условий."""
+
+        groups = CachedGroupQuerySet(Group)
+        get_group(pk=self.group.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(groups.get(pk=self.group.pk), self.group)
+            self.assertEqual(groups.get(slug=self.group.slug), self.group)
+        with self.assertNumQueries(1):
+            with self.assertRaises(Group.DoesNotExist):
+                groups.filter(title='Другая').get(pk=self.group.pk)
+
+    def test_form_validates_group_from_cache(self):
+        get_group(pk=self.group.pk)
+        form = PostForm(data={'text': 'Текст', 'group': self.group.pk})
+        # Остаётся только проверка внешнего ключа в Post.full_clean().
+        with self.assertNumQueries(1):
+            self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['group'], self.group)
+        form = PostForm(data={'text': 'Текст', 'group': 'abc'})
+        self.assertFalse(form.is_valid())
+        self.assertIn('group', form.errors)
+
+
+class GroupCacheCommitTest(TransactionTestCase):
+    def test_version_changes_after_commit(self):
+        """Кеш сбрасывается ещё раз после коммита транзакции."""
+
+        group = Group.objects.create(title='Группа', slug='group',
+                                     description='Описание')
+        with transaction.atomic():
+            group.title = 'Новое название'
+            group.save()
+            # Запрос из другого соединения мог закешировать старую строку.
+            version = get_group_cache().get(_VERSION_KEY)
+        self.assertNotEqual(get_group_cache().get(_VERSION_KEY), version)
+
+
+class PostFormGroupsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.groups = [
+            Group.objects.create(title=f'Группа {number}',
+                                 slug=f'group-{number}', description='')
+            for number in range(3)
+        ]
+        cls.post = Post.objects.create(author=cls.user, text='Пост',
+                                       group=cls.groups[1])
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_choices_are_cached(self):
+        """Форма выводит все группы, а с прогретым кешем не читает их."""
+
+        url = reverse('posts:post_create')
+        self.authorized_client.get(url)
+        # Сессия и пользователь.
+        with self.assertNumQueries(2):
+            response = self.authorized_client.get(url)
+        for group in self.groups:
+            self.assertContains(response, group.title)
+        self.assertNotContains(response, 'data-autocomplete-url="')
+
+    def test_new_group_appears_in_choices(self):
+        self.assertEqual(len(list(PostForm().fields['group'].choices)), 4)
+        Group.objects.create(title='Новая группа', slug='new',
+                             description='')
+        choices = list(PostForm().fields['group'].choices)
+        self.assertEqual(choices[-1][1], 'Новая группа')
+
+    @override_settings(GROUP_CHOICES_LIMIT=2)
+    def test_large_group_set_uses_autocomplete(self):
+        """При большом числе групп выводится только выбранная."""
+
+        response = self.authorized_client.get(
+            reverse('posts:post_edit', args=(self.post.pk,)))
+        self.assertContains(response, reverse('api:group_search'))
+        self.assertContains(response, self.groups[1].title)
+        self.assertNotContains(response, self.groups[0].title)
+        self.assertNotContains(response, self.groups[2].title)
@@ -1,5 +1,10 @@
+from http import HTTPStatus
+from io import StringIO
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
 
 from posts.models import Group, Post
 
@@ -29,3 +34,55 @@ class PostModelTest(TestCase):
         expected_text = post.text
         self.assertIsInstance(expected_object_name, str)
         self.assertIsInstance(expected_text, str)
+
+
+class PostRenderTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    def test_html_and_title_are_computed_on_save(self):
+        """HTML и заголовок считаются при сохранении и правке текста."""
+
+        post = Post.objects.create(author=self.user,
+                                   text='<b>Первая</b>\nвторая строка')
+        self.assertEqual(post.text_html,
+                         '&lt;b&gt;Первая&lt;/b&gt;<br>вторая строка')
+        self.assertEqual(post.title, '<b>Первая</b>\nвторая строка')
+
+        modified = post.modified
+        post.text = 'Очень длинный текст, который не влезет в заголовок'
+        post.save(update_fields=['text'])
+        post.refresh_from_db()
+        self.assertGreater(post.modified, modified)
+        self.assertEqual(len(post.title), 30)
+        self.assertTrue(post.title.endswith('…'))
+        self.assertIn('Очень длинный', post.text_html)
+
+    def test_render_posts_command(self):
+        post = Post.objects.create(author=self.user, text='Текст')
+        Post.objects.filter(pk=post.pk).update(text_html='', title='')
+        out = StringIO()
+        call_command('render_posts', missing=True, stdout=out)
+        post.refresh_from_db()
+        self.assertEqual(post.text_html, 'Текст')
+        self.assertEqual(post.title, 'Текст')
+        self.assertIn('Обработано постов: 1', out.getvalue())
+
+    def test_render_posts_updates_pages(self):
+        """После render_posts страницы отдаются заново, а не 304."""
+
+        post = Post.objects.create(author=self.user, text='Текст')
+        client = Client()
+        urls = (reverse('posts:index'),
+                reverse('posts:post_detail', args=(post.pk,)))
+        etags = {url: client.get(url)['ETag'] for url in urls}
+        Post.objects.filter(pk=post.pk).update(text_html='Новый HTML')
+
+        call_command('render_posts', stdout=StringIO())
+
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
@@ -0,0 +1,127 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Group, Post
+from posts.cache import INDEX_FEED, group_feed
+from posts.paginators import CachedCountPaginator, CursorPaginator
+
+User = get_user_model()
+
+
+class CursorPaginatorTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for number in range(13):
+            Post.objects.create(author=cls.user, text=f'Пост {number}',
+                                group=cls.group)
+        # У части постов одинаковая дата: порядок решает id.
+        Post.objects.filter(pk__lte=5).update(pub_date=timezone.now())
+        cls.expected = list(Post.objects.order_by('-pub_date', '-pk'))
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_pages_follow_each_other(self):
+        """Страницы по курсору идут без пропусков и повторов."""
+
+        paginator = CursorPaginator(Post.objects.all(), 5)
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        third = paginator.page(second.next_cursor)
+
+        self.assertFalse(first.has_previous())
+        self.assertFalse(third.has_next())
+        self.assertEqual(list(first) + list(second) + list(third),
+                         self.expected)
+
+    def test_previous_cursor_returns_previous_page(self):
+        """Курсор назад возвращает предыдущую страницу."""
+
+        paginator = CursorPaginator(Post.objects.all(), 5)
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        back = paginator.page(second.previous_cursor)
+
+        self.assertEqual(list(back), list(first))
+        self.assertFalse(back.has_previous())
+
+    def test_invalid_cursor_returns_first_page(self):
+        """Неверный курсор отдаёт первую страницу."""
+
+        paginator = CursorPaginator(Post.objects.all(), 5)
+        self.assertEqual(list(paginator.get_page('мусор')),
+                         self.expected[:5])
+
+    @override_settings(FEED_CURSOR_PAGINATION=True)
+    def test_feeds_use_cursor(self):
+        """Ленты в курсорном режиме отдают страницы по ?cursor=."""
+
+        urls = (reverse('posts:index'),
+                reverse('posts:group_list', args=(self.group.slug,)),
+                reverse('posts:profile', args=(self.user.username,)))
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                page_obj = response.context['page_obj']
+                self.assertEqual(len(page_obj), 10)
+                self.assertContains(response, page_obj.next_cursor)
+
+                response = self.guest_client.get(
+                    url, {'cursor': page_obj.next_cursor})
+                self.assertEqual(list(response.context['page_obj']),
+                                 self.expected[10:])
+
+
+class CachedCountPaginatorTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for number in range(3):
+            Post.objects.create(author=cls.user, text=f'Пост {number}',
+                                group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_count_is_cached(self):
+        """Количество постов считается один раз и берётся из кеша."""
+
+        CachedCountPaginator(Post.objects.all(), 2, INDEX_FEED).count
+        with self.assertNumQueries(0):
+            count = CachedCountPaginator(Post.objects.all(), 2,
+                                         INDEX_FEED).count
+        self.assertEqual(count, 3)
+
+    def test_count_follows_post_changes(self):
+        """Закешированное количество меняется вместе с постами."""
+
+        feed = group_feed(self.group.pk)
+        posts = Post.objects.filter(group=self.group)
+        CachedCountPaginator(posts, 2, feed).count
+
+        post = Post.objects.create(author=self.user, text='Новый',
+                                   group=self.group)
+        self.assertEqual(CachedCountPaginator(posts, 2, feed).count, 4)
+
+        post.group = None
+        post.save()
+        self.assertEqual(CachedCountPaginator(posts, 2, feed).count, 3)
+
+        Post.objects.filter(group=self.group).first().delete()
+        self.assertEqual(CachedCountPaginator(posts, 2, feed).count, 2)
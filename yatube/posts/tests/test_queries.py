@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+from posts.tests.utils import assert_constant_queries
+
+User = get_user_model()
+
+
+class FeedQueriesTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.user = User.objects.create_user(username='auth')
+        for number in range(12):
+            author = User.objects.create_user(username=f'author{number}')
+            Post.objects.create(author=author, text='Тестовый пост',
+                                group=cls.group)
+            Post.objects.create(author=cls.user, text='Тестовый пост',
+                                group=cls.group)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_feed_queries_do_not_depend_on_page_size(self):
+        """Количество запросов к ленте не зависит от числа постов."""
+
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.user.username,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                assert_constant_queries(self, self.guest_client, url)
@@ -0,0 +1,63 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post
+from posts.search import FTS_TABLE
+
+User = get_user_model()
+
+
+class PostSearchTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.cat_post = Post.objects.create(
+            author=cls.user, text='Кот спит на диване')
+        cls.cats_post = Post.objects.create(
+            author=cls.user, text='Кот, кот и ещё один кот')
+        cls.dog_post = Post.objects.create(
+            author=cls.user, text='Собака гуляет во дворе')
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def search(self, query):
+        response = self.guest_client.get(reverse('posts:search'),
+                                         {'q': query})
+        return list(response.context['page_obj'])
+
+    def test_search_is_ranked(self):
+        """Поиск находит посты по словам, самые релевантные первыми."""
+
+        self.assertEqual(self.search('КОТ'),
+                         [self.cats_post, self.cat_post])
+        self.assertEqual(self.search('собак'), [self.dog_post])
+        self.assertEqual(self.search('"'), [])
+
+    def test_index_follows_post_changes(self):
+        """Индекс обновляется при изменении и удалении поста."""
+
+        post = Post.objects.get(pk=self.dog_post.pk)
+        post.text = 'Кот прогнал собаку'
+        post.save()
+        self.assertIn(post, self.search('кот'))
+
+        Post.objects.get(pk=self.cat_post.pk).delete()
+        self.assertEqual(self.search('диван'), [])
+
+    def test_rebuild_search_index(self):
+        """Команда rebuild_search_index восстанавливает индекс."""
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        self.assertEqual(self.search('кот'), [])
+
+        call_command('rebuild_search_index', stdout=StringIO())
+
+        self.assertEqual(len(self.search('кот')), 2)
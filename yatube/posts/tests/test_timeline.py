@@ -0,0 +1,149 @@
+from http import HTTPStatus
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Follow, Group, GroupFollow, Post, TimelineEntry
+from posts.timeline import trim_timelines
+from tasks.models import Job
+from tasks.worker import Worker
+
+User = get_user_model()
+
+
+class TimelineTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create_user(username='reader')
+        cls.author = User.objects.create_user(username='author')
+        cls.stranger = User.objects.create_user(username='stranger')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.reader)
+
+    def timeline_ids(self, user=None):
+        return list(TimelineEntry.objects.filter(user=user or self.reader)
+                    .order_by('-pub_date', '-id')
+                    .values_list('post_id', flat=True))
+
+    def test_new_post_is_fanned_out_to_followers(self):
+        """Новый пост попадает в ленты подписчиков автора и группы."""
+
+        Follow.objects.create(user=self.reader, author=self.author)
+        GroupFollow.objects.create(user=self.stranger, group=self.group)
+        post = Post.objects.create(author=self.author, text='Пост',
+                                   group=self.group)
+        other = Post.objects.create(author=self.stranger, text='Чужой')
+
+        self.assertEqual(self.timeline_ids(), [post.pk])
+        self.assertEqual(self.timeline_ids(self.stranger),
+                         [other.pk, post.pk])
+        self.assertEqual(self.timeline_ids(self.author), [post.pk])
+
+    def test_post_moved_to_group_reaches_group_followers(self):
+        GroupFollow.objects.create(user=self.reader, group=self.group)
+        post = Post.objects.create(author=self.author, text='Пост')
+        self.assertEqual(self.timeline_ids(), [])
+        post.group = self.group
+        post.save()
+        self.assertEqual(self.timeline_ids(), [post.pk])
+
+    def test_follow_and_unfollow_views(self):
+        """Подписка добавляет старые посты в ленту, отписка убирает."""
+
+        in_group = Post.objects.create(author=self.author, text='В группе',
+                                       group=self.group)
+        alone = Post.objects.create(author=self.author, text='Без группы')
+
+        self.client.post(reverse('posts:profile_follow',
+                                 args=(self.author.username,)))
+        self.client.post(reverse('posts:group_follow',
+                                 args=(self.group.slug,)))
+        self.assertEqual(self.timeline_ids(), [alone.pk, in_group.pk])
+
+        self.client.post(reverse('posts:profile_unfollow',
+                                 args=(self.author.username,)))
+        self.assertFalse(Follow.objects.filter(user=self.reader).exists())
+        self.assertEqual(self.timeline_ids(), [in_group.pk])
+
+        self.client.post(reverse('posts:group_unfollow',
+                                 args=(self.group.slug,)))
+        self.assertEqual(self.timeline_ids(), [])
+
+    def test_cannot_follow_self_or_by_get(self):
+        url = reverse('posts:profile_follow', args=(self.reader.username,))
+        self.client.post(url)
+        self.assertFalse(Follow.objects.exists())
+        response = self.client.get(
+            reverse('posts:profile_follow', args=(self.author.username,)))
+        self.assertEqual(response.status_code,
+                         HTTPStatus.METHOD_NOT_ALLOWED)
+
+    @override_settings(TIMELINE_MAX_ENTRIES=3)
+    def test_timeline_is_capped(self):
+        Follow.objects.create(user=self.reader, author=self.author)
+        posts = [Post.objects.create(author=self.author, text=f'Пост {i}')
+                 for i in range(5)]
+        self.assertEqual(trim_timelines([self.reader.pk]), 2)
+        self.assertEqual(self.timeline_ids(),
+                         [post.pk for post in posts[:1:-1]])
+        self.assertEqual(len(self.timeline_ids(self.author)), 5)
+        call_command('trim_timelines', stdout=StringIO())
+        self.assertEqual(len(self.timeline_ids(self.author)), 3)
+
+    @override_settings(PAGINATOR=2)
+    def test_timeline_view_pages_by_cursor(self):
+        """Лента подписок читается по курсору за постоянное число
+           запросов.
+        """
+
+        Follow.objects.create(user=self.reader, author=self.author)
+        posts = [Post.objects.create(author=self.author, text=f'Пост {i}')
+                 for i in range(3)]
+        url, seen = reverse('posts:timeline'), []
+        response = self.client.get(url)
+        while True:
+            page_obj = response.context['page_obj']
+            seen += [post.pk for post in page_obj]
+            if not page_obj.has_next():
+                break
+            response = self.client.get(url,
+                                       {'cursor': page_obj.next_cursor})
+        self.assertEqual(seen, [post.pk for post in reversed(posts)])
+        self.assertTemplateUsed(response, 'posts/timeline.html')
+
+    def test_timeline_requires_login(self):
+        response = Client().get(reverse('posts:timeline'))
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+    def test_backfill_command(self):
+        post = Post.objects.create(author=self.author, text='Пост')
+        Follow.objects.create(user=self.reader, author=self.author)
+        TimelineEntry.objects.all().delete()
+        call_command('backfill_timelines', stdout=StringIO())
+        self.assertEqual(self.timeline_ids(), [post.pk])
+        self.assertEqual(self.timeline_ids(self.author), [post.pk])
+
+    @override_settings(TASKS_EAGER=False)
+    def test_fan_out_runs_in_worker(self):
+        """При включённой очереди лента и индекс обновляются воркером."""
+
+        Follow.objects.create(user=self.reader, author=self.author)
+        post = Post.objects.create(author=self.author, text='Пост')
+        self.assertEqual(self.timeline_ids(), [])
+        self.assertEqual(
+            sorted(Job.objects.values_list('name', flat=True)),
+            ['posts.tasks.fan_out_post', 'posts.tasks.index_posts'])
+
+        Worker(concurrency=1).run(burst=True)
+        self.assertEqual(self.timeline_ids(), [post.pk])
@@ -1,10 +1,11 @@
 from django import forms
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import Client, TestCase
 from django.urls import reverse
 
-from posts.models import Group, Post
+from posts.models import Follow, Group, Post
 
 User = get_user_model()
 
@@ -221,3 +222,84 @@ class PaginatorViewsTest(TestCase):
             with self.subTest(adress=adress):
                 response = self.guest_client.get(adress)
                 self.assertEqual(len(response.context['page_obj']), 3)
+
+
+class ProfileQueriesTest(TestCase):
+    """Профиль: один запрос за автором и один за страницей постов."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author',
+                                              first_name='Лев',
+                                              last_name='Толстой')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for number in range(15):
+            Post.objects.create(author=cls.author, text=f'Пост {number}',
+                                group=cls.group if number % 2 else None)
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.reader)
+        self.url = reverse('posts:profile', args=(self.author.username,))
+
+    def test_guest_profile_queries(self):
+        for page in (1, 2):
+            with self.subTest(page=page):
+                cache.clear()
+                with self.assertNumQueries(2):
+                    response = self.guest_client.get(self.url,
+                                                     {'page': page})
+                self.assertEqual(response.context['count'], 15)
+                self.assertEqual(response.context['page_obj'].paginator.count,
+                                 15)
+
+    def test_authorized_profile_queries(self):
+        """Сессия, пользователь, автор с подпиской и страница постов."""
+
+        with self.assertNumQueries(4):
+            response = self.authorized_client.get(self.url)
+        self.assertTrue(response.context['following'])
+        self.assertContains(response, 'Отписаться')
+
+    def test_cached_page_still_needs_two_queries(self):
+        self.guest_client.get(self.url)
+        with self.assertNumQueries(2):
+            self.guest_client.get(self.url)
+
+    def test_unknown_author(self):
+        with self.assertNumQueries(1):
+            response = self.guest_client.get(
+                reverse('posts:profile', args=('missing',)))
+        self.assertEqual(response.status_code, 404)
+
+    def test_author_without_profile(self):
+        """Профиль создаётся при первом обращении, а не падает с 500."""
+
+        User.objects.bulk_create([User(username='bulk')])
+        author = User.objects.get(username='bulk')
+        post = Post.objects.create(author=author, text='Пост без профиля')
+        author.profile.delete()
+        for url in (reverse('posts:profile', args=('bulk',)),
+                    reverse('posts:post_detail', args=(post.pk,))):
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.context['count'], 1)
+
+    def test_groups_are_loaded_with_page(self):
+        """Группы постов не догружаются по одной при отрисовке."""
+
+        response = self.guest_client.get(self.url)
+        with self.assertNumQueries(0):
+            slugs = [post.group and post.group.slug
+                     for post in response.context['page_obj']]
+        self.assertIn(self.group.slug, slugs)
@@ -0,0 +1,31 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+
+def count_queries(client, url):
+    """Возвращает количество SQL-запросов при загрузке страницы
+       без кеша.
+    """
+
+    cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    return len(context.captured_queries)
+
+
+def assert_constant_queries(test_case, client, url, page_sizes=(2, 10)):
+    """Проверяет, что число запросов к странице не зависит
+       от количества постов на ней.
+    """
+
+    counts = []
+    for page_size in page_sizes:
+        with override_settings(PAGINATOR=page_size):
+            counts.append(count_queries(client, url))
+    test_case.assertEqual(
+        len(set(counts)), 1,
+        f'Число запросов к {url} зависит от размера страницы: {counts}'
+    )
+    return counts[0]
@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.db.models import Count, Q
+
+from .models import Follow, GroupFollow, Post, PostQuerySet, TimelineEntry
+
+BATCH_SIZE = 500
+
+
+def timeline_readers(author_id, group_id):
+    """id пользователей, в чьи ленты подписок попадает пост.
+
+       Автор всегда видит в своей ленте собственные посты.
+    """
+
+    readers = set(Follow.objects.filter(author_id=author_id)
+                  .values_list('user_id', flat=True))
+    if group_id is not None:
+        readers.update(GroupFollow.objects.filter(group_id=group_id)
+                       .values_list('user_id', flat=True))
+    readers.add(author_id)
+    return readers
+
+
+def add_entries(user_ids, posts):
+    """Добавляет посты в ленты пользователей, пропуская уже добавленные."""
+
+    entries = [TimelineEntry(user_id=user_id, post_id=post.pk,
+                             pub_date=post.pub_date)
+               for user_id in user_ids for post in posts]
+    TimelineEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE,
+                                      ignore_conflicts=True)
+
+
+def fan_out(post):
+    """Раскладывает пост по лентам подписчиков автора и группы."""
+
+    add_entries(timeline_readers(post.author_id, post.group_id), [post])
+
+
+def trim_timelines(user_ids=None):
+    """Оставляет в лентах не больше TIMELINE_MAX_ENTRIES новых записей.
+
+       При публикации лишние записи не удаляются, чтобы раскладка поста
+       не зависела от длины лент: лимит наводится этой функцией
+       из команды trim_timelines. Возвращает число удалённых записей.
+    """
+
+    limit = settings.TIMELINE_MAX_ENTRIES
+    overflowing = (TimelineEntry.objects.values('user_id')
+                   .annotate(entries=Count('id'))
+                   .filter(entries__gt=limit))
+    if user_ids is not None:
+        overflowing = overflowing.filter(user_id__in=user_ids)
+    deleted = 0
+    for user_id in overflowing.values_list('user_id', flat=True):
+        entries = TimelineEntry.objects.filter(user_id=user_id)
+        pub_date, pk = entries.order_by('-pub_date', '-id').values_list(
+            'pub_date', 'id')[limit]
+        deleted += entries.filter(
+            Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lte=pk)
+        ).delete()[0]
+    return deleted
+
+
+def subscribed_posts(user):
+    """Посты ленты подписок, собранные при чтении (fan-out on read)."""
+
+    return Post.objects.filter(
+        Q(author_id__in=Follow.objects.filter(user=user).values('author_id'))
+        | Q(group_id__in=GroupFollow.objects.filter(user=user)
+            .values('group_id'))
+        | Q(author=user)
+    )
+
+
+def backfill_timeline(user):
+    """Заново собирает ленту пользователя из его подписок."""
+
+    posts = subscribed_posts(user).only('id', 'pub_date').order_by(
+        '-pub_date', '-id')[:settings.TIMELINE_MAX_ENTRIES]
+    add_entries([user.pk], list(posts))
+    trim_timelines([user.pk])
+
+
+def forget_author(user, author):
+    """Убирает из ленты посты автора, кроме пришедших через группы."""
+
+    groups = GroupFollow.objects.filter(user=user).values('group_id')
+    TimelineEntry.objects.filter(user=user, post__author=author).exclude(
+        post__group_id__in=groups).delete()
+
+
+def forget_group(user, group):
+    """Убирает из ленты посты группы, кроме пришедших через авторов."""
+
+    authors = Follow.objects.filter(user=user).values('author_id')
+    TimelineEntry.objects.filter(user=user, post__group=group).exclude(
+        post__author_id__in=authors).exclude(post__author=user).delete()
+
+
+def timeline_entries(user):
+    """Записи ленты вместе с постами, авторами и группами."""
+
+    fields = ('id', 'pub_date', 'post_id') + tuple(
+        f'post__{field}' for field in PostQuerySet.FEED_FIELDS)
+    return (TimelineEntry.objects.filter(user=user)
+            .select_related('post__author', 'post__group').only(*fields))
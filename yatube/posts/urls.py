@@ -1,7 +1,10 @@
 from django.urls import path
 
-from posts.views import (group_posts, index, post_create, post_edit, post_view,
-                         profile)
+from posts.feeds import atom_feed, json_feed, rss_feed
+
+from posts.views import (group_follow, group_posts, group_unfollow, index,
+                         post_create, post_edit, post_view, profile,
+                         profile_follow, profile_unfollow, search, timeline)
 
 app_name = 'posts'
 urlpatterns = [
@@ -11,4 +14,22 @@ urlpatterns = [
     path('posts/<int:post_id>/', post_view, name='post_detail'),
     path('create/', post_create, name='post_create'),
     path('posts/<int:post_id>/edit/', post_edit, name='post_edit'),
+    path('search/', search, name='search'),
+    path('timeline/', timeline, name='timeline'),
+    path('profile/<str:username>/follow/', profile_follow,
+         name='profile_follow'),
+    path('profile/<str:username>/unfollow/', profile_unfollow,
+         name='profile_unfollow'),
+    path('group/<slug:slug>/follow/', group_follow, name='group_follow'),
+    path('group/<slug:slug>/unfollow/', group_unfollow,
+         name='group_unfollow'),
+    path('feed/rss/', rss_feed, name='index_rss'),
+    path('feed/atom/', atom_feed, name='index_atom'),
+    path('feed/json/', json_feed, name='index_json'),
+    path('group/<slug:slug>/rss/', rss_feed, name='group_rss'),
+    path('group/<slug:slug>/atom/', atom_feed, name='group_atom'),
+    path('group/<slug:slug>/json/', json_feed, name='group_json'),
+    path('profile/<str:username>/rss/', rss_feed, name='profile_rss'),
+    path('profile/<str:username>/atom/', atom_feed, name='profile_atom'),
+    path('profile/<str:username>/json/', json_feed, name='profile_json'),
 ]
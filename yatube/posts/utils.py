@@ -0,0 +1,82 @@
+import hashlib
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .paginators import (CachedCountPaginator, CursorPaginator,
+                         KnownCountPaginator)
+
+
+def get_page_obj(request, queryset, cursor=False, count_key=None, count=None):
+    """Возвращает страницу постов для ленты.
+
+       При cursor=True используется курсорная пагинация по ?cursor=,
+       иначе обычная постраничная по ?page=. С count общее количество
+       постов уже известно, с count_key оно берётся из кеша.
+    """
+
+    if cursor:
+        paginator = CursorPaginator(queryset, settings.PAGINATOR)
+        return paginator.get_page(request.GET.get('cursor'))
+    if count is not None:
+        paginator = KnownCountPaginator(queryset, settings.PAGINATOR, count)
+    elif count_key is not None:
+        paginator = CachedCountPaginator(queryset, settings.PAGINATOR,
+                                         count_key)
+    else:
+        paginator = Paginator(queryset, settings.PAGINATOR)
+    return paginator.get_page(request.GET.get('page'))
+
+
+def make_validators(request, posts_state, *extra, csrf=False):
+    """ETag страницы без её отрисовки.
+
+       posts_state — пары (id, modified) выводимых постов, extra — прочие
+       данные страницы (количество постов, номер страницы). Пользователь
+       входит в ETag, потому что шапка сайта у каждого своя; для страниц
+       с формами (csrf=True) — и CSRF-токен, который меняется при входе.
+
+       Last-Modified не отдаётся: ни удаление поста со страницы, ни смена
+       пользователя или токена не меняют время изменения постов.
+    """
+
+    token = None
+    if csrf:
+        # get_token() выдаёт токен, если его ещё нет, но каждый раз
+        # с новой солью, поэтому в ETag идёт сам секрет из cookie.
+        get_token(request)
+        token = request.META['CSRF_COOKIE']
+    raw = repr((list(posts_state), extra, request.user.pk, token)).encode()
+    return quote_etag(hashlib.md5(raw).hexdigest())
+
+
+def page_validators(request, page_obj, *extra, csrf=False):
+    """ETag для страницы ленты.
+
+       Страница загружается здесь один раз и потом используется шаблоном,
+       чтобы не делать отдельный запрос за (id, modified).
+    """
+
+    if getattr(page_obj, 'is_cursor_page', False):
+        extra += (page_obj.has_next(), page_obj.has_previous())
+    else:
+        extra += (page_obj.number, page_obj.paginator.count)
+    page_obj.object_list = list(page_obj.object_list)
+    posts_state = ((post.pk, post.modified) for post in page_obj.object_list)
+    return make_validators(request, posts_state, *extra, csrf=csrf)
+
+
+def not_modified(request, etag):
+    """Ответ 304, если у клиента актуальная версия страницы, иначе None."""
+
+    return get_conditional_response(request, etag=etag)
+
+
+def with_validators(response, etag):
+    """Добавляет к ответу заголовок ETag."""
+
+    response['ETag'] = etag
+    return response
@@ -2,12 +2,24 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
-from django.core.paginator import Paginator
+from django.db.models import Exists, OuterRef
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.http import urlencode
+from django.views.decorators.http import require_POST
 
+from posts.cache import INDEX_FEED, author_feed, feed_cache, group_feed
+from posts.counters import author_posts_count
 from posts.forms import PostForm
+from posts.groups import get_group_or_404
+from posts.paginators import CursorPaginator
+from posts.search import get_search_backend
+from posts.timeline import (backfill_timeline, forget_author, forget_group,
+                            timeline_entries)
+from posts.utils import (get_page_obj, make_validators, not_modified,
+                         page_validators, with_validators)
+from users.summaries import attach_author_summaries
 
-from .models import Group, Post
+from .models import Follow, GroupFollow, Post
 
 User = get_user_model()
 
@@ -15,31 +27,56 @@ User = get_user_model()
 def index(request):
     """View - функция для главной страницы проекта."""
 
-    posts = Post.objects.all()
-    paginator = Paginator(posts, settings.PAGINATOR)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    posts = Post.objects.feed()
+    page_obj = get_page_obj(request, posts,
+                            cursor=settings.FEED_CURSOR_PAGINATION,
+                            count_key=INDEX_FEED)
+    # Версия ленты в ETag: её сбрасывают и изменения, которых не видно
+    # по постам страницы (например, новое имя автора).
+    cache_params = feed_cache(INDEX_FEED, page_obj)
+    validators = page_validators(request, page_obj, cache_params['key'])
+    response = not_modified(request, validators)
+    if response is not None:
+        return response
+    page_obj.object_list = attach_author_summaries(page_obj.object_list)
     context = {
         'page_obj': page_obj,
+        'feed_cache': cache_params,
     }
-    return render(request, 'posts/index.html', context)
+    return with_validators(render(request, 'posts/index.html', context),
+                           validators)
 
 
 def group_posts(request, slug):
     """View - функция для страницы с постами, отфильтрованными по группам."""
 
-    group = get_object_or_404(Group, slug=slug)
-    posts = Post.objects.filter(group=group)
-    paginator = Paginator(posts, settings.PAGINATOR)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    group = get_group_or_404(slug=slug)
+    feed = group_feed(group.pk)
+    posts = Post.objects.feed().filter(group=group)
+    page_obj = get_page_obj(request, posts,
+                            cursor=settings.FEED_CURSOR_PAGINATION,
+                            count_key=feed)
+    following = (request.user.is_authenticated
+                 and GroupFollow.objects.filter(user=request.user,
+                                                group=group).exists())
+    cache_params = feed_cache(feed, page_obj)
+    validators = page_validators(request, page_obj, cache_params['key'],
+                                 group.title, group.description, following,
+                                 csrf=True)
+    response = not_modified(request, validators)
+    if response is not None:
+        return response
+    page_obj.object_list = attach_author_summaries(page_obj.object_list)
     context = {
         'group': group,
+        'following': following,
         'page_obj': page_obj,
+        'feed_cache': cache_params,
 
     }
 
-    return render(request, 'posts/group_list.html', context)
+    return with_validators(
+        render(request, 'posts/group_list.html', context), validators)
 
 
 def profile(request, username):
@@ -47,30 +84,135 @@ def profile(request, username):
        вошедшего на сайт.
     """
 
-    author = get_object_or_404(User, username=username)
-    count = author.posts.all().count()
-    paginator = Paginator(author.posts.all(), settings.PAGINATOR)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Автор, счётчик постов и подписка читаются одним запросом.
+    authors = User.objects.select_related('profile').only(
+        'username', 'first_name', 'last_name', 'profile__posts_count')
+    if request.user.is_authenticated:
+        authors = authors.annotate(followed=Exists(Follow.objects.filter(
+            user=request.user, author=OuterRef('pk'))))
+    author = get_object_or_404(authors, username=username)
+    count = author_posts_count(author)
+    following = getattr(author, 'followed', False)
+    feed = author_feed(author.pk)
+    posts = Post.objects.feed().filter(author=author)
+    page_obj = get_page_obj(request, posts,
+                            cursor=settings.FEED_CURSOR_PAGINATION,
+                            count=count)
+    cache_params = feed_cache(feed, page_obj)
+    validators = page_validators(request, page_obj, cache_params['key'],
+                                 str(author), count, following, csrf=True)
+    response = not_modified(request, validators)
+    if response is not None:
+        return response
 
     context = {'author': author,
                'count': count,
+               'following': following,
                'page_obj': page_obj,
+               'feed_cache': cache_params,
 
                }
-    return render(request, 'posts/profile.html', context)
+    return with_validators(
+        render(request, 'posts/profile.html', context), validators)
 
 
 def post_view(request, post_id):
     """View - функция для страницы определенного поста."""
 
-    post = get_object_or_404(Post, pk=post_id)
-    count = Post.objects.filter(author=post.author).count()
+    post = get_object_or_404(
+        Post.objects.select_related('author__profile', 'group'), pk=post_id)
+    count = author_posts_count(post.author)
+    validators = make_validators(request, [(post.pk, post.modified)],
+                                 str(post.author), count, str(post.group),
+                                 csrf=True)
+    response = not_modified(request, validators)
+    if response is not None:
+        return response
 
     context = {'post': post,
                'count': count,
                }
-    return render(request, 'posts/post_detail.html', context)
+    return with_validators(
+        render(request, 'posts/post_detail.html', context), validators)
+
+
+def search(request):
+    """View - функция для поиска по текстам постов."""
+
+    query = request.GET.get('q', '').strip()
+    results = get_search_backend().search(query)
+    page_obj = get_page_obj(request, results)
+    page_obj.object_list = attach_author_summaries(page_obj.object_list)
+    context = {'query': query,
+               'page_obj': page_obj,
+               'extra_query': urlencode({'q': query}) + '&',
+               }
+    return render(request, 'posts/search.html', context)
+
+
+@login_required
+def timeline(request):
+    """View - функция для ленты подписок пользователя.
+
+       Лента читается из заранее разложенных записей по курсору.
+    """
+
+    paginator = CursorPaginator(timeline_entries(request.user),
+                                settings.PAGINATOR)
+    page_obj = paginator.get_page(request.GET.get('cursor'))
+    page_obj.object_list = attach_author_summaries(
+        entry.post for entry in page_obj.object_list)
+    return render(request, 'posts/timeline.html', {'page_obj': page_obj})
+
+
+@login_required
+@require_POST
+def profile_follow(request, username):
+    """View - функция для подписки на автора."""
+
+    author = get_object_or_404(User, username=username)
+    if author != request.user:
+        _, created = Follow.objects.get_or_create(user=request.user,
+                                                  author=author)
+        if created:
+            backfill_timeline(request.user)
+    return redirect('posts:profile', username)
+
+
+@login_required
+@require_POST
+def profile_unfollow(request, username):
+    """View - функция для отписки от автора."""
+
+    author = get_object_or_404(User, username=username)
+    if Follow.objects.filter(user=request.user, author=author).delete()[0]:
+        forget_author(request.user, author)
+    return redirect('posts:profile', username)
+
+
+@login_required
+@require_POST
+def group_follow(request, slug):
+    """View - функция для подписки на группу."""
+
+    group = get_group_or_404(slug=slug)
+    _, created = GroupFollow.objects.get_or_create(user=request.user,
+                                                   group=group)
+    if created:
+        backfill_timeline(request.user)
+    return redirect('posts:group_list', slug)
+
+
+@login_required
+@require_POST
+def group_unfollow(request, slug):
+    """View - функция для отписки от группы."""
+
+    group = get_group_or_404(slug=slug)
+    if GroupFollow.objects.filter(user=request.user,
+                                  group=group).delete()[0]:
+        forget_group(request.user, group)
+    return redirect('posts:group_list', slug)
 
 
 @login_required
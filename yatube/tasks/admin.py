@@ -0,0 +1,24 @@
+from django.contrib import admin
+
+from .models import Job, OutgoingEmail
+
+
+class JobAdmin(admin.ModelAdmin):
+    """Класс для настройки отображения модели в интерфейсе админки."""
+
+    list_display = ('pk', 'name', 'status', 'attempts', 'run_after',
+                    'updated',)
+    list_filter = ('status', 'name',)
+    readonly_fields = ('payload', 'last_error',)
+
+
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    """Класс для настройки отображения модели в интерфейсе админки."""
+
+    list_display = ('pk', 'created', 'sent', 'batch',)
+    list_filter = ('sent',)
+    readonly_fields = ('payload',)
+
+
+admin.site.register(Job, JobAdmin)
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
@@ -0,0 +1,117 @@
+import json
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import (EmailMessage, EmailMultiAlternatives,
+                              get_connection)
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+def dump_message(message):
+    """Письмо в JSON; вложения не поддерживаются."""
+
+    return json.dumps({
+        'subject': message.subject,
+        'body': message.body,
+        'from_email': message.from_email,
+        'to': message.to,
+        'cc': message.cc,
+        'bcc': message.bcc,
+        'reply_to': message.reply_to,
+        'headers': message.extra_headers,
+        'alternatives': getattr(message, 'alternatives', []),
+    })
+
+
+def load_message(payload):
+    data = json.loads(payload)
+    alternatives = data.pop('alternatives')
+    message = EmailMultiAlternatives(**data)
+    for content, mimetype in alternatives:
+        message.attach_alternative(content, mimetype)
+    return message
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Складывает письма в очередь вместо отправки в запросе.
+
+       Письма отправляет задача flush_outbox через QUEUED_EMAIL_BACKEND.
+    """
+
+    def send_messages(self, email_messages):
+        from .tasks import flush_outbox
+
+        messages = [message for message in email_messages
+                    if message.recipients()]
+        if not messages:
+            return 0
+        for message in messages:
+            if not isinstance(message, EmailMessage) or message.attachments:
+                raise ValueError('Письма с вложениями в очередь не ставятся.')
+        OutgoingEmail.objects.bulk_create(
+            [OutgoingEmail(payload=dump_message(message))
+             for message in messages])
+        # Задача попадает в ту же транзакцию, что и письма.
+        flush_outbox.delay()
+        return len(messages)
+
+
+def claim_batch(size):
+    """Помечает до size неотправленных писем общей меткой пачки."""
+
+    batch = uuid.uuid4().hex
+    pending = list(OutgoingEmail.objects.filter(
+        sent__isnull=True, batch='').values_list('pk', flat=True)[:size])
+    OutgoingEmail.objects.filter(pk__in=pending, batch='').update(
+        batch=batch, claimed=timezone.now())
+    return batch, list(OutgoingEmail.objects.filter(batch=batch))
+
+
+def requeue_stale_emails():
+    """Возвращает в очередь письма из пачек, которые забрал и не отправил
+       упавший воркер.
+    """
+
+    deadline = timezone.now() - timedelta(
+        seconds=settings.TASKS_RUNNING_TIMEOUT)
+    return OutgoingEmail.objects.filter(
+        sent__isnull=True, claimed__lt=deadline).exclude(batch='').update(
+        batch='', claimed=None)
+
+
+def flush(batch_size=None):
+    """Отправляет накопленные письма пачками через одно соединение.
+
+       Возвращает число отправленных писем. При ошибке письма пачки
+       возвращаются в очередь, а исключение пробрасывается, чтобы задача
+       была повторена.
+    """
+
+    batch_size = batch_size or settings.EMAIL_BATCH_SIZE
+    requeue_stale_emails()
+    sent = 0
+    # Соединение открывается один раз на все пачки.
+    connection = get_connection(settings.QUEUED_EMAIL_BACKEND)
+    try:
+        while True:
+            batch, emails = claim_batch(batch_size)
+            if not emails:
+                break
+            try:
+                connection.open()
+                connection.send_messages(
+                    [load_message(email.payload) for email in emails])
+            except Exception:
+                OutgoingEmail.objects.filter(batch=batch).update(
+                    batch='', claimed=None)
+                raise
+            OutgoingEmail.objects.filter(batch=batch).update(
+                sent=timezone.now())
+            sent += len(emails)
+    finally:
+        connection.close()
+    return sent
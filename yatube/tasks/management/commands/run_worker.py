@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from tasks.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Выполняет задачи из очереди в пуле потоков.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--poll-interval', type=float, default=1.0)
+        parser.add_argument('--burst', action='store_true',
+                            help='Выйти, когда очередь опустеет.')
+
+    def handle(self, *args, **options):
+        worker = Worker(concurrency=options['concurrency'],
+                        poll_interval=options['poll_interval'])
+        try:
+            processed = worker.run(burst=options['burst'])
+        except KeyboardInterrupt:
+            worker.stop()
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Выполнено задач: {processed}'
+        ))
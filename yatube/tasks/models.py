@@ -0,0 +1,67 @@
+import json
+
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """Задача в очереди: имя зарегистрированной функции и её аргументы."""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (QUEUED, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(max_length=200)
+    # JSON с позиционными и именованными аргументами.
+    payload = models.TextField(default='{}')
+    status = models.CharField(max_length=10, choices=STATUSES,
+                              default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['run_after', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_after', 'id'],
+                         name='job_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
+
+    @property
+    def arguments(self):
+        data = json.loads(self.payload)
+        return data.get('args', []), data.get('kwargs', {})
+
+
+class OutgoingEmail(models.Model):
+    """Письмо, ожидающее отправки воркером.
+
+       batch — метка пачки, которую забрал воркер; пустая у ещё
+       не забранных писем. claimed — когда пачку забрали: по нему
+       находятся пачки упавших воркеров.
+    """
+
+    payload = models.TextField()
+    batch = models.CharField(max_length=32, blank=True, db_index=True)
+    claimed = models.DateTimeField(null=True, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    sent = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f'Письмо #{self.pk}'
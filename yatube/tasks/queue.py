@@ -0,0 +1,117 @@
+import json
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+class UnknownTask(LookupError):
+    """В очереди задача, которой нет в реестре."""
+
+
+class Task:
+    """Функция, которую можно поставить в очередь через delay()."""
+
+    def __init__(self, func, name, max_attempts):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, **kwargs):
+        return enqueue(self.name, *args, **kwargs)
+
+
+def task(name=None, max_attempts=None):
+    """Регистрирует функцию как задачу очереди.
+
+       Аргументы задачи должны сериализоваться в JSON.
+    """
+
+    def decorator(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        registry[task_name] = Task(
+            func, task_name, max_attempts or settings.TASKS_MAX_ATTEMPTS)
+        return registry[task_name]
+
+    return decorator
+
+
+def enqueue(name, *args, **kwargs):
+    """Ставит задачу в очередь и возвращает Job.
+
+       При TASKS_EAGER задача выполняется сразу и Job не создаётся.
+       Запись Job создаётся в текущей транзакции: при её откате задача
+       тоже пропадает.
+    """
+
+    if name not in registry:
+        raise UnknownTask(name)
+    if settings.TASKS_EAGER:
+        registry[name](*args, **kwargs)
+        return None
+    return Job.objects.create(
+        name=name, max_attempts=registry[name].max_attempts,
+        payload=json.dumps({'args': args, 'kwargs': kwargs}))
+
+
+def claim(limit):
+    """Забирает до limit готовых к запуску задач.
+
+       Задача достаётся тому воркеру, чей UPDATE первым сменил статус,
+       поэтому воркеров можно запускать несколько.
+    """
+
+    candidates = Job.objects.filter(
+        status=Job.QUEUED, run_after__lte=timezone.now(),
+    ).values_list('pk', flat=True)[:limit]
+    claimed = []
+    for pk in candidates:
+        updated = Job.objects.filter(pk=pk, status=Job.QUEUED).update(
+            status=Job.RUNNING, attempts=F('attempts') + 1,
+            updated=timezone.now())
+        if updated:
+            claimed.append(pk)
+    return list(Job.objects.filter(pk__in=claimed))
+
+
+def retry_delay(attempts):
+    """Экспоненциальная пауза перед следующей попыткой."""
+
+    return timedelta(seconds=settings.TASKS_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def execute(job):
+    """Выполняет задачу и записывает результат; повторяет при ошибке."""
+
+    try:
+        if job.name not in registry:
+            raise UnknownTask(job.name)
+        args, kwargs = job.arguments
+        registry[job.name](*args, **kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            status = Job.QUEUED
+            run_after = timezone.now() + retry_delay(job.attempts)
+        else:
+            status, run_after = Job.FAILED, job.run_after
+            logger.error('Задача %s не выполнена: %s', job, error)
+        Job.objects.filter(pk=job.pk).update(
+            status=status, run_after=run_after, last_error=error,
+            updated=timezone.now())
+        return False
+    Job.objects.filter(pk=job.pk).update(status=Job.DONE,
+                                         updated=timezone.now())
+    return True
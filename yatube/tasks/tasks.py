@@ -0,0 +1,9 @@
+from .mail import flush
+from .queue import task
+
+
+@task()
+def flush_outbox():
+    """Отправляет письма из очереди."""
+
+    flush()
@@ -0,0 +1,165 @@
+import asyncore
+import socket
+import threading
+import warnings
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.mail import claim_batch, requeue_stale_emails
+from tasks.models import Job, OutgoingEmail
+from tasks.worker import Worker
+
+with warnings.catch_warnings():
+    warnings.simplefilter('ignore', DeprecationWarning)
+    import smtpd
+
+User = get_user_model()
+
+
+class RecordingSMTPServer(smtpd.SMTPServer):
+    """Отладочный SMTP-сервер: запоминает письма и соединения."""
+
+    def __init__(self):
+        self.socket_map = {}
+        super().__init__(('127.0.0.1', 0), None, decode_data=True,
+                         map=self.socket_map)
+        self.port = self.socket.getsockname()[1]
+        self.messages = []
+        self.connections = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+
+    def handle_accepted(self, conn, addr):
+        self.connections += 1
+        smtpd.SMTPChannel(self, conn, addr, decode_data=True,
+                          map=self.socket_map)
+
+    def process_message(self, peer, mailfrom, rcpttos, data, **kwargs):
+        self.messages.append((rcpttos, data))
+
+    def serve(self):
+        while not self.stopped.is_set():
+            asyncore.loop(timeout=0.05, count=1, map=self.socket_map)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        self.close()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@override_settings(EMAIL_BACKEND='tasks.mail.QueuedEmailBackend',
+                   QUEUED_EMAIL_BACKEND=(
+                       'django.core.mail.backends.smtp.EmailBackend'),
+                   EMAIL_HOST='127.0.0.1', EMAIL_BATCH_SIZE=2,
+                   TASKS_EAGER=False, TASKS_RETRY_DELAY=0)
+class QueuedEmailBackendTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth',
+                                            email='auth@example.com',
+                                            password='Sup3r-secret-pass')
+
+    def setUp(self):
+        self.server = RecordingSMTPServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.settings_override = override_settings(
+            EMAIL_PORT=self.server.port)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def test_messages_are_sent_by_worker_over_one_connection(self):
+        """Письма уходят воркером пачками через одно соединение."""
+
+        for number in range(3):
+            mail.send_mail(f'Тема {number}', 'Текст', 'from@example.com',
+                           [f'user{number}@example.com'])
+        self.assertEqual(self.server.messages, [])
+        self.assertEqual(OutgoingEmail.objects.count(), 3)
+
+        Worker(concurrency=1).run(burst=True)
+
+        self.assertEqual(len(self.server.messages), 3)
+        self.assertEqual(self.server.connections, 1)
+        self.assertFalse(
+            OutgoingEmail.objects.filter(sent__isnull=True).exists())
+
+    def test_password_reset_is_not_sent_in_request(self):
+        response = Client().post(reverse('users:password_reset'),
+                                 {'email': self.user.email})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.server.messages, [])
+
+        Worker(concurrency=1).run(burst=True)
+
+        (recipients, data), = self.server.messages
+        self.assertEqual(recipients, [self.user.email])
+        self.assertIn('/auth/reset/', data)
+
+    def test_failed_delivery_is_retried(self):
+        """Если SMTP недоступен, письма остаются в очереди."""
+
+        with override_settings(EMAIL_PORT=free_port()):
+            mail.send_mail('Тема', 'Текст', 'from@example.com',
+                           ['user@example.com'])
+            Worker(concurrency=1).run_once()
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(OutgoingEmail.objects.get().batch, '')
+
+        Worker(concurrency=1).run(burst=True)
+        self.assertEqual(len(self.server.messages), 1)
+
+    def test_stale_batch_is_requeued(self):
+        """Письма пачки упавшего воркера снова уходят в отправку."""
+
+        mail.send_mail('Тема', 'Текст', 'from@example.com',
+                       ['user@example.com'])
+        batch, emails = claim_batch(10)
+        self.assertEqual(len(emails), 1)
+        self.assertEqual(requeue_stale_emails(), 0)
+        OutgoingEmail.objects.update(
+            claimed=timezone.now() - timedelta(hours=1))
+
+        with self.assertLogs('tasks.worker', level='WARNING') as logs:
+            Worker(concurrency=1).run(burst=True)
+
+        self.assertIn('Возвращено в очередь зависших писем: 1',
+                      logs.output[0])
+        self.assertEqual(len(self.server.messages), 1)
+        self.assertFalse(
+            OutgoingEmail.objects.filter(sent__isnull=True).exists())
+
+
+@override_settings(EMAIL_BACKEND='tasks.mail.QueuedEmailBackend',
+                   QUEUED_EMAIL_BACKEND=(
+                       'django.core.mail.backends.locmem.EmailBackend'),
+                   TASKS_EAGER=True)
+class SignUpEmailTest(TestCase):
+    def test_welcome_email_on_signup(self):
+        Client().post(reverse('users:signup'), {
+            'first_name': 'Лев',
+            'last_name': 'Толстой',
+            'username': 'leo',
+            'email': 'leo@example.com',
+            'password1': 'Sup3r-secret-pass',
+            'password2': 'Sup3r-secret-pass',
+        })
+        message, = mail.outbox
+        self.assertEqual(message.to, ['leo@example.com'])
+        self.assertIn('Лев Толстой', message.body)
@@ -0,0 +1,90 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from tasks.models import Job
+from tasks.queue import UnknownTask, enqueue, registry, task
+from tasks.worker import Worker, requeue_stale
+
+calls = []
+
+
+@task(name='tests.record')
+def record(value, times=1):
+    calls.extend([value] * times)
+
+
+@task(name='tests.flaky', max_attempts=2)
+def flaky():
+    calls.append('flaky')
+    raise ValueError('сбой')
+
+
+@override_settings(TASKS_EAGER=False, TASKS_RETRY_DELAY=0)
+class QueueTest(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_delay_creates_job(self):
+        job = record.delay('a', times=2)
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(job.arguments, (['a'], {'times': 2}))
+        self.assertEqual(calls, [])
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_runs_immediately(self):
+        self.assertIsNone(record.delay('a'))
+        self.assertEqual(calls, ['a'])
+        self.assertFalse(Job.objects.exists())
+
+    def test_unknown_task(self):
+        with self.assertRaises(UnknownTask):
+            enqueue('tests.missing')
+
+    def test_worker_runs_jobs(self):
+        record.delay('a')
+        record.delay('b')
+        processed = Worker(concurrency=1).run(burst=True)
+        self.assertEqual(processed, 2)
+        self.assertEqual(calls, ['a', 'b'])
+        self.assertEqual(
+            set(Job.objects.values_list('status', flat=True)), {Job.DONE})
+
+    def test_failed_job_is_retried_then_failed(self):
+        job = flaky.delay()
+        with self.assertLogs('tasks.queue', level='ERROR'):
+            Worker(concurrency=1).run(burst=True)
+        job.refresh_from_db()
+        self.assertEqual(calls, ['flaky', 'flaky'])
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertIn('ValueError', job.last_error)
+
+    def test_delayed_retry_waits(self):
+        job = Job.objects.create(
+            name='tests.record', payload='{"args": ["later"]}',
+            run_after=timezone.now() + timedelta(minutes=5))
+        self.assertEqual(Worker(concurrency=1).run(burst=True), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+
+    def test_stale_jobs_are_requeued(self):
+        job = record.delay('a')
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.RUNNING,
+            updated=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale(), 1)
+
+    def test_run_worker_command(self):
+        record.delay('a')
+        out = StringIO()
+        call_command('run_worker', concurrency=1, burst=True, stdout=out)
+        self.assertIn('Выполнено задач: 1', out.getvalue())
+
+    def test_post_tasks_are_registered(self):
+        for name in ('posts.tasks.index_posts', 'posts.tasks.fan_out_post'):
+            with self.subTest(name=name):
+                self.assertIn(name, registry)
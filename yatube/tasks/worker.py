@@ -0,0 +1,83 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from .mail import requeue_stale_emails
+from .models import Job
+from .queue import claim, execute
+
+logger = logging.getLogger(__name__)
+
+
+def requeue_stale():
+    """Возвращает в очередь задачи, зависшие в работе после падения
+       воркера.
+    """
+
+    deadline = timezone.now() - timedelta(
+        seconds=settings.TASKS_RUNNING_TIMEOUT)
+    return Job.objects.filter(status=Job.RUNNING,
+                              updated__lt=deadline).update(
+        status=Job.QUEUED, updated=timezone.now())
+
+
+class Worker:
+    """Забирает задачи из базы и выполняет их в пуле потоков.
+
+       При concurrency=1 задачи выполняются в текущем потоке.
+    """
+
+    def __init__(self, concurrency=4, poll_interval=1.0):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.stopped = threading.Event()
+        self.executor = (ThreadPoolExecutor(concurrency)
+                         if concurrency > 1 else None)
+
+    def _execute(self, job):
+        try:
+            return execute(job)
+        finally:
+            # У каждого потока своё соединение с базой.
+            if self.executor is not None:
+                connection.close()
+
+    def run_once(self):
+        """Выполняет пачку готовых задач, возвращает их число."""
+
+        close_old_connections()
+        jobs = claim(self.concurrency)
+        if self.executor is None:
+            results = [self._execute(job) for job in jobs]
+        else:
+            results = list(self.executor.map(self._execute, jobs))
+        return len(results)
+
+    def run(self, burst=False):
+        """Работает до вызова stop(); с burst=True — пока есть задачи."""
+
+        stale = requeue_stale()
+        if stale:
+            logger.warning('Возвращено в очередь зависших задач: %s', stale)
+        stale = requeue_stale_emails()
+        if stale:
+            logger.warning('Возвращено в очередь зависших писем: %s', stale)
+        processed = 0
+        while not self.stopped.is_set():
+            done = self.run_once()
+            processed += done
+            if not done:
+                if burst:
+                    break
+                self.stopped.wait(self.poll_interval)
+        if self.executor is not None:
+            self.executor.shutdown()
+        return processed
+
+    def stop(self):
+        self.stopped.set()
@@ -16,3 +16,14 @@ class SignUp(models.Model):
         """Для вывода имени пользователя"""
 
         return self.username
+
+
+class Profile(models.Model):
+    """Профиль автора: хранит счётчик его постов."""
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE,
+                                related_name='profile')
+    posts_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f'Профиль {self.user}'
@@ -0,0 +1,77 @@
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+
+from .models import Profile
+
+User = get_user_model()
+
+# То, что лента выводит об авторе поста.
+AuthorSummary = namedtuple('AuthorSummary',
+                           'id username display_name posts_count')
+
+
+def get_author_cache():
+    return caches[settings.AUTHOR_CACHE_ALIAS]
+
+
+def _key(user_id):
+    return f'author-summary:{user_id}'
+
+
+def summarize(user):
+    """Сводка об авторе по пользователю с загруженным профилем."""
+
+    try:
+        posts_count = user.profile.posts_count
+    except Profile.DoesNotExist:
+        posts_count = 0
+    return AuthorSummary(user.pk, user.username,
+                         user.get_full_name() or user.username, posts_count)
+
+
+def get_author_summaries(user_ids):
+    """Сводки авторов {id: AuthorSummary}.
+
+       Все сводки читаются из кеша одним get_many, недостающие —
+       одним запросом к БД.
+    """
+
+    user_ids = {pk for pk in user_ids if pk is not None}
+    if not user_ids:
+        return {}
+    cache = get_author_cache()
+    keys = {_key(pk): pk for pk in user_ids}
+    summaries = {keys[key]: AuthorSummary(*value)
+                 for key, value in cache.get_many(keys).items()}
+    missing = user_ids - summaries.keys()
+    if missing:
+        users = (User.objects.filter(pk__in=missing)
+                 .select_related('profile')
+                 .only('username', 'first_name', 'last_name',
+                       'profile__posts_count'))
+        loaded = {user.pk: summarize(user) for user in users}
+        cache.set_many({_key(pk): tuple(summary)
+                        for pk, summary in loaded.items()},
+                       settings.AUTHOR_CACHE_TIMEOUT)
+        summaries.update(loaded)
+    return summaries
+
+
+def forget_authors(*user_ids):
+    """Удаляет сводки авторов из кеша."""
+
+    get_author_cache().delete_many([_key(pk) for pk in user_ids
+                                    if pk is not None])
+
+
+def attach_author_summaries(posts):
+    """Проставляет постам author_summary и возвращает их списком."""
+
+    posts = list(posts)
+    summaries = get_author_summaries(post.author_id for post in posts)
+    for post in posts:
+        post.author_summary = summaries.get(post.author_id)
+    return posts
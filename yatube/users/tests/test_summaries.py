@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post
+from users.summaries import get_author_summaries
+
+User = get_user_model()
+
+
+class AuthorSummaryTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.leo = User.objects.create_user(username='leo', first_name='Лев',
+                                           last_name='Толстой')
+        cls.anon = User.objects.create_user(username='anon')
+        for author in (cls.leo, cls.leo, cls.anon):
+            Post.objects.create(author=author, text='Тестовый пост')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_summaries_are_fetched_together(self):
+        """Все авторы читаются одним запросом, потом только из кеша."""
+
+        ids = (self.leo.pk, self.anon.pk)
+        with self.assertNumQueries(1):
+            summaries = get_author_summaries(ids)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_author_summaries(ids), summaries)
+        leo, anon = summaries[self.leo.pk], summaries[self.anon.pk]
+        self.assertEqual(leo.display_name, 'Лев Толстой')
+        self.assertEqual(leo.username, 'leo')
+        self.assertEqual(leo.posts_count, 2)
+        self.assertEqual(anon.display_name, 'anon')
+        self.assertEqual(get_author_summaries([None]), {})
+
+    def test_user_change_resets_summary(self):
+        get_author_summaries([self.leo.pk])
+        user = User.objects.get(pk=self.leo.pk)
+        user.first_name = 'Лёва'
+        user.save()
+        summary = get_author_summaries([self.leo.pk])[self.leo.pk]
+        self.assertEqual(summary.display_name, 'Лёва Толстой')
+
+    def test_new_post_updates_count(self):
+        get_author_summaries([self.anon.pk])
+        Post.objects.create(author=self.anon, text='Ещё пост')
+        summary = get_author_summaries([self.anon.pk])[self.anon.pk]
+        self.assertEqual(summary.posts_count, 2)
+
+    def test_feed_renders_summaries(self):
+        """Лента выводит имена авторов из сводок без запросов к БД."""
+
+        response = Client().get(reverse('posts:index'))
+        self.assertContains(response, 'Лев Толстой')
+        self.assertContains(response, 'anon')
+        with self.assertNumQueries(0):
+            names = {post.author_summary.display_name
+                     for post in response.context['page_obj']}
+        self.assertEqual(names, {'Лев Толстой', 'anon'})
+
+    def test_rename_updates_cached_feeds(self):
+        """Новое имя автора сразу видно в закешированных лентах."""
+
+        client = Client()
+        urls = (reverse('posts:index'),
+                reverse('posts:profile', args=(self.leo.username,)))
+        etags = [client.get(url)['ETag'] for url in urls]
+        user = User.objects.get(pk=self.leo.pk)
+        user.first_name = 'Лёва'
+        user.save()
+        for url, etag in zip(urls, etags):
+            with self.subTest(url=url):
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+        self.assertContains(client.get(urls[0]), 'Лёва Толстой')
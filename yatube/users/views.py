@@ -1,3 +1,5 @@
+from django.core.mail import send_mail
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy
 from django.views.generic import CreateView
 
@@ -11,3 +13,14 @@ class SignUp(CreateView):
     # После успешной регистрации перенаправляем пользователя на главную.
     success_url = reverse_lazy('posts:index')
     template_name = 'users/signup.html'
+
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        user = self.object
+        if user.email:
+            # Письмо уходит через очередь и не задерживает ответ.
+            send_mail('Добро пожаловать в Yatube',
+                      render_to_string('users/welcome_email.txt',
+                                       {'user': user}),
+                      None, [user.email])
+        return response
@@ -0,0 +1,13 @@
+"""Настройки проекта.
+
+   Профиль выбирается переменной окружения YATUBE_ENV: dev (по умолчанию),
+   test или prod. Можно указать и модуль профиля напрямую:
+   DJANGO_SETTINGS_MODULE=yatube.settings.prod.
+"""
+
+import os
+from importlib import import_module
+
+_profile = import_module(f"{__name__}.{os.getenv('YATUBE_ENV', 'dev')}")
+globals().update((name, value) for name, value in vars(_profile).items()
+                 if name.isupper())
@@ -0,0 +1,226 @@
+"""Общие настройки; профили dev, test и prod дополняют их."""
+
+import os
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+# Имя профиля настроек, его проверяет core.checks.
+SETTINGS_PROFILE = 'base'
+
+SECRET_KEY = os.getenv('DJANGO_SECRET_KEY', '')
+
+
+DEBUG = False
+
+ALLOWED_HOSTS = []
+
+
+INSTALLED_APPS = [
+    'about.apps.AboutConfig',
+    'core.apps.CoreConfig',
+    'users.apps.UsersConfig',
+    'posts.apps.PostsConfig',
+    'benchmarks.apps.BenchmarksConfig',
+    'api.apps.ApiConfig',
+    'tasks.apps.TasksConfig',
+    'django.contrib.admin',
+    'django.contrib.auth',  # Приложение для регистрация и авторизация пользователей
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+]
+
+MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'yatube.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [os.path.join(BASE_DIR, 'templates')],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+
+        },
+    },
+]
+
+WSGI_APPLICATION = 'yatube.wsgi.application'
+
+APPEND_SLASH = True
+
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        # Сколько секунд ждать снятия блокировки записи.
+        'OPTIONS': {'timeout': 20},
+    }
+}
+
+# Выполняются для каждого нового соединения с SQLite (core.signals);
+# настройки для боевого режима — SQLITE_TUNED_PRAGMAS в prod.py.
+SQLITE_PRAGMAS = {}
+# WAL позволяет читать во время записи, synchronous=NORMAL в режиме WAL
+# не теряет целостность, но реже вызывает fsync.
+SQLITE_TUNED_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -20000,
+    'temp_store': 'MEMORY',
+}
+
+
+def replica_databases(variable):
+    """Настройки реплик replica1, replica2... из переменной окружения."""
+
+    names = filter(None, os.getenv(variable, '').split(','))
+    return {f'replica{number}': dict(DATABASES['default'], NAME=name)
+            for number, name in enumerate(names, 1)}
+
+
+# Реплики только для чтения: пути к их базам через запятую в переменной
+# окружения DATABASE_REPLICAS. Схему локальной SQLite-реплики создаёт
+# migrate --database=replica1.
+DATABASES.update(replica_databases('DATABASE_REPLICAS'))
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+DATABASE_ROUTERS = ['core.db.ReplicaRouter']
+# View, которые только читают и могут обращаться к репликам
+REPLICA_READ_VIEWS = {
+    'posts:index', 'posts:group_list', 'posts:profile', 'posts:post_detail',
+    'about:author', 'about:tech',
+}
+# Сколько секунд после записи сессия читает только с основной базы
+REPLICA_STICKY_SECONDS = 15
+
+
+# Бэкенд кеша задаётся окружением: locmem по умолчанию, файловый
+# (django.core.cache.backends.filebased.FileBasedCache) или внешний,
+# например локальный Redis через django-redis.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND',
+                             'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+STATIC_URL = '/static/'
+STATICFILES_DIRS = (os.path.join(BASE_DIR, "static"),)
+LOGIN_URL = 'users:login'
+LOGIN_REDIRECT_URL = 'posts:index'
+# LOGOUT_REDIRECT_URL = 'posts:index'
+
+# Письма ставятся в очередь (tasks) и отправляются воркером пачками
+# через QUEUED_EMAIL_BACKEND; для SMTP задайте EMAIL_HOST и EMAIL_PORT.
+EMAIL_BACKEND = "tasks.mail.QueuedEmailBackend"
+QUEUED_EMAIL_BACKEND = os.getenv(
+    'QUEUED_EMAIL_BACKEND', "django.core.mail.backends.filebased.EmailBackend")
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, "sent_emails")
+# Сколько писем отправляется за одну пачку
+EMAIL_BATCH_SIZE = 50
+
+PAGINATOR = 10
+# Курсорная пагинация лент (?cursor=) вместо постраничной (?page=)
+FEED_CURSOR_PAGINATION = False
+# Кеш отрисованных страниц лент постов
+FEED_CACHE_ALIAS = 'default'
+FEED_CACHE_TIMEOUT = 60 * 5
+# Сколько хранится в кеше общее количество постов ленты
+PAGINATOR_COUNT_TIMEOUT = 60 * 60
+# Полнотекстовый поиск по постам; для PostgreSQL —
+# 'posts.search.PostgresSearchBackend'
+POSTS_SEARCH_BACKEND = 'posts.search.SQLiteFTSBackend'
+# RSS/Atom/JSON-фиды: число записей и время жизни в кеше
+SYNDICATION_ITEMS = 20
+SYNDICATION_CACHE_TIMEOUT = 60 * 15
+# Кеш групп по slug и pk: общий кеш и LRU в памяти процесса
+GROUP_CACHE_ALIAS = 'default'
+GROUP_CACHE_TIMEOUT = 60 * 60 * 24
+GROUP_CACHE_SIZE = 1024
+# Больше групп в форме поста не выводится: остальные ищутся
+# автодополнением по GROUP_AUTOCOMPLETE_LIMIT штук
+GROUP_CHOICES_LIMIT = 1000
+GROUP_AUTOCOMPLETE_LIMIT = 20
+# Сводки авторов (имя, логин, число постов) для вывода лент
+AUTHOR_CACHE_ALIAS = 'default'
+AUTHOR_CACHE_TIMEOUT = 60 * 60 * 24
+# Сколько последних постов хранится в ленте подписок пользователя
+TIMELINE_MAX_ENTRIES = 1000
+
+# Фоновые задачи (tasks): без запущенного run_worker их нужно выполнять
+# сразу, поэтому очередь включается переменной окружения TASKS_EAGER=0.
+TASKS_EAGER = os.getenv('TASKS_EAGER', '1') == '1'
+TASKS_MAX_ATTEMPTS = 3
+# Пауза перед повтором в секундах, удваивается с каждой попыткой
+TASKS_RETRY_DELAY = 10
+# Через сколько секунд задача в работе считается зависшей
+TASKS_RUNNING_TIMEOUT = 60 * 10
+
+# Метрики запросов: заголовок Server-Timing и гистограммы по view
+REQUEST_METRICS_ENABLED = True
+# Бюджет SQL-запросов на запрос; превышение пишется в лог core.middleware
+REQUEST_QUERY_BUDGET_DEFAULT = 10
+REQUEST_QUERY_BUDGETS = {
+    'posts:index': 6,
+    'posts:group_list': 7,
+    'posts:profile': 4,
+    'posts:post_detail': 4,
+    # Запись поста: сессия, пользователь, пост, счётчики и постановка
+    # задач; с TASKS_EAGER задачи выполняются здесь же и добавляют запросы.
+    'posts:post_create': 14,
+    'posts:post_edit': 16,
+    'api:post_list': 2,
+    'api:group_posts': 3,
+    'api:profile': 2,
+    'api:group_search': 1,
+}
@@ -0,0 +1,11 @@
+"""Локальная разработка: отладка, письма в файлы, задачи сразу."""
+
+from .base import *  # noqa: F401,F403
+
+SETTINGS_PROFILE = 'dev'
+
+SECRET_KEY = '@9t_4b72w)#kz58&wq_xg7fx9$gfj&=+*_=@&^o(37d#!h)^qx'
+
+DEBUG = True
+
+ALLOWED_HOSTS = ['testserver', '127.0.0.1', 'localhost', ]
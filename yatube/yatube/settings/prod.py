@@ -0,0 +1,61 @@
+"""Боевой режим: без отладки, с кешем шаблонов и сессий,
+   с настроенным SQLite и постоянными соединениями.
+
+   SECRET_KEY и ALLOWED_HOSTS задаются окружением.
+"""
+
+import copy
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import CACHES, DATABASES, SQLITE_TUNED_PRAGMAS, TEMPLATES
+
+SETTINGS_PROFILE = 'prod'
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+
+DEBUG = False
+
+ALLOWED_HOSTS = os.getenv('DJANGO_ALLOWED_HOSTS', '').split(',')
+
+# WAL, mmap и кеш страниц для каждого соединения; соединение живёт
+# между запросами (0 — новое на каждый запрос).
+SQLITE_PRAGMAS = SQLITE_TUNED_PRAGMAS
+DATABASES = copy.deepcopy(DATABASES)
+for database in DATABASES.values():
+    database['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', 60))
+
+# Шаблоны компилируются один раз на процесс.
+TEMPLATES = copy.deepcopy(TEMPLATES)
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+TEMPLATES[0]['OPTIONS']['context_processors'].remove(
+    'django.template.context_processors.debug')
+
+# Без внешнего кеша по умолчанию — файловый: его делят все процессы.
+if 'CACHE_BACKEND' not in os.environ:
+    CACHES = dict(CACHES)
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', '/var/tmp/yatube-cache'),
+    }
+
+# Сессия читается из кеша, в базу идёт только запись.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# В боевом режиме задачи выполняет run_worker.
+TASKS_EAGER = os.getenv('TASKS_EAGER', '0') == '1'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'loggers': {
+        # Текст SQL-запросов не логируется и не копится в памяти.
+        'django.db.backends': {'level': 'WARNING', 'propagate': True},
+    },
+}
@@ -0,0 +1,28 @@
+"""Прогон тестов: быстрые пароли, задачи и письма без воркера."""
+
+from .base import *  # noqa: F401,F403
+from .base import DATABASES, replica_databases
+
+SETTINGS_PROFILE = 'test'
+
+SECRET_KEY = 'test-secret-key'
+
+ALLOWED_HOSTS = ['testserver', ]
+
+# Стойкость хеша паролей в тестах не нужна, а PBKDF2 заметно медленнее.
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+TASKS_EAGER = True
+QUEUED_EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+# Метрики и предупреждения о бюджете запросов проверяют только тесты
+# core.tests.test_middleware, включая их явно.
+REQUEST_METRICS_ENABLED = False
+
+# Реплики из DATABASE_REPLICAS в тестах не используются: чтения ушли бы
+# в пустые базы. core.tests.test_db.ReplicaIntegrationTest включает
+# реплики из TEST_DATABASE_REPLICAS сам.
+DATABASES = {'default': DATABASES['default'],
+             **replica_databases('TEST_DATABASE_REPLICAS')}
+DATABASE_REPLICAS = []
+TEST_DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']